@@ -3,8 +3,15 @@ import sys
 import os
 from collections import defaultdict
 import traceback
+from rank_snapshots import AVERAGE_FOLDER, SnapshotStore, print_movement
+from exam_schema import columns_by_family
+from super40_scoring import incremental_top_k, report_changes, score_matrix, state_path_for, top_k_sum
+from apportionment import apportion, select_top_per_class
 
-def process_exam_data(file_path):
+# Per-student top-4 state kept between runs (per source sheet), so a new exam column only updates it
+TOPK_STATE_NAME = 'super40_average'
+
+def process_exam_data(file_path, state_path=None):
     # Determine file type and read accordingly
     if file_path.endswith('.csv'):
         df = pd.read_csv(file_path)
@@ -19,39 +26,38 @@ def process_exam_data(file_path):
     print("\nFirst few rows of the data:")
     print(df.head())
 
-    # Function to get top 4 scores
-    def get_top_4_total(row, columns):
-        scores = []
-        for col in columns:
-            if pd.notna(row[col]):
-                # Check if the score is in fractional format
-                if '/' in str(row[col]):
-                    numerator, _ = map(float, str(row[col]).split('/'))
-                    scores.append(numerator)
-                else:
-                    scores.append(float(row[col]))
-        return sum(sorted(scores, reverse=True)[:4])
-
-    # Separate GAT and MATHS columns
-    gat_columns = [col for col in df.columns if 'Total Marks' in col and 'GAT' in str(df[col.replace('Total Marks', 'Exam')].iloc[0])]
-    maths_columns = [col for col in df.columns if 'Total Marks' in col and 'MATHS' in str(df[col.replace('Total Marks', 'Exam')].iloc[0])]
+    # Separate GAT and MATHS columns by the exam family of each Exam label
+    family_columns = columns_by_family(df)
+    gat_columns = family_columns.get('GAT', [])
+    maths_columns = family_columns.get('MATHS', [])
 
     print("\nGAT columns:", gat_columns)
     print("MATHS columns:", maths_columns)
 
-    # Process GAT Marks
-    df['Total GAT (Top 4)'] = df.apply(lambda row: get_top_4_total(row, gat_columns), axis=1)
+    subj_columns = [f'Subjective Marks{i}' for i in range(1, 6)]  # Assuming there are 5 subjective exams; missing ones are skipped
+    if state_path:
+        # Incremental mode: only exam columns added since the last run are parsed
+        categories = {'GAT': gat_columns, 'MATHS': maths_columns, 'Subjective': subj_columns}
+        totals, changes = incremental_top_k(df, categories, state_path, k=4)
+        report_changes(changes, os.path.splitext(file_path)[0] + '_topk_changes.csv')
+        df['Total GAT (Top 4)'] = totals['GAT']
+        df['Total MATHS (Top 4)'] = totals['MATHS']
+    else:
+        # Process GAT Marks
+        df['Total GAT (Top 4)'] = top_k_sum(score_matrix(df, gat_columns), k=4)
 
-    # Process MATHS Marks
-    df['Total MATHS (Top 4)'] = df.apply(lambda row: get_top_4_total(row, maths_columns), axis=1)
+        # Process MATHS Marks
+        df['Total MATHS (Top 4)'] = top_k_sum(score_matrix(df, maths_columns), k=4)
 
     # Print sample results for debugging
     print("\nSample results:")
     print(df[['Total GAT (Top 4)', 'Total MATHS (Top 4)']].head())
 
     # Process Subjective Marks
-    subj_columns = [f'Subjective Marks{i}' for i in range(1, 6)]  # Assuming there are 5 subjective exams
-    df['Total Subjective (Top 4)'] = df.apply(lambda row: get_top_4_total(row, subj_columns), axis=1)
+    if state_path:
+        df['Total Subjective (Top 4)'] = totals['Subjective']
+    else:
+        df['Total Subjective (Top 4)'] = top_k_sum(score_matrix(df, subj_columns), k=4)
 
     # Calculate Grand Total
     df['Grand Total'] = df['Total GAT (Top 4)'] + df['Total MATHS (Top 4)'] + df['Total Subjective (Top 4)']
@@ -65,31 +71,13 @@ def select_top_students(df, total_students=40, exclude_class="XI- JEE/NEET"):
     # Exclude the specified class
     df_filtered = df[df['CLASS'] != exclude_class]
 
-    # Group students by class
-    class_groups = df_filtered.groupby('CLASS')
-    
-    # Calculate the number of students to select from each class
-    class_sizes = class_groups.size()
-    total_class_size = class_sizes.sum()
-    students_per_class = (class_sizes / total_class_size * total_students).round().astype(int)
-    
-    # Adjust if the total is not exactly 40
-    while students_per_class.sum() != total_students:
-        if students_per_class.sum() < total_students:
-            students_per_class[students_per_class.idxmin()] += 1
-        else:
-            students_per_class[students_per_class.idxmax()] -= 1
+    # Seats per class in proportion to class size (largest remainder)
+    class_sizes = df_filtered['CLASS'].value_counts().to_dict()
+    students_per_class = apportion(class_sizes, total_students, method='hamilton')
     
     # Select top students from each class
-    selected_students = []
-    for class_name, group in class_groups:
-        top_n = students_per_class[class_name]
-        top_students = group.nlargest(top_n, 'Average Score')
-        selected_students.append(top_students)
-    
-    # Combine all selected students
-    result = pd.concat(selected_students)
-    return result.sort_values('Average Score', ascending=False)
+    result = select_top_per_class(df_filtered, students_per_class, 'Average Score')
+    return result.sort_values('Average Score', ascending=False, kind='stable')
 
 def clean_file_path(file_path):
     # Remove leading '&' if present
@@ -122,7 +110,7 @@ def main():
         return
 
     try:
-        df = process_exam_data(file_path)
+        df = process_exam_data(file_path, state_path=state_path_for(TOPK_STATE_NAME, file_path))
         top_students = select_top_students(df)
         
         print("Super 40 students (excluding XI- JEE/NEET class):")
@@ -133,6 +121,12 @@ def main():
         top_students.to_excel(output_file, index=False)
         print(f"\nSuper 40 students data saved to: {output_file}")
 
+        # Keep the full ranking of this run for week-over-week comparison
+        snapshots = SnapshotStore(AVERAGE_FOLDER)
+        run_id = snapshots.record(df, 'Average Score', top_students['NAME'], source=file_path)
+        print(f"Ranking snapshot saved as run {run_id}")
+        print_movement(snapshots)
+
         # Print excluded class data separately
         excluded_class_data = df[df['CLASS'] == "XI- JEE/NEET"].sort_values('Average Score', ascending=False)
         print("\nXI- JEE/NEET class data (excluded from Super 40):")
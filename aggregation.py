@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# How to combine a column's values for rows that share a key:
+#   join   every distinct non-blank value, in order of appearance, joined by ', '
+#   first  the first non-blank value
+#   last   the last non-blank value
+#   max    the largest numeric value (text that is not a number is ignored)
+POLICIES = ['join', 'first', 'last', 'max']
+
+
+def group_codes(keys):
+    """Factorise the key column once: (codes, sorted unique keys); blank keys get code -1."""
+    codes, uniques = pd.factorize(keys, sort=True)
+    return codes, uniques
+
+
+def join_distinct(values, codes, n_groups, separator=', '):
+    """Distinct non-blank values per group, joined in order of appearance.
+
+    Each (group, value) pair is kept once, then the strings are joined in a
+    single pass over the pairs sorted by group. Matches
+    separator.join(map(str, x.dropna().unique())) per group.
+    """
+    value_codes, uniques = pd.factorize(values)
+    keep = (codes >= 0) & (value_codes >= 0)
+    rows = np.flatnonzero(keep)
+    pairs = codes[rows].astype(np.int64) * max(len(uniques), 1) + value_codes[rows]
+    # First appearance of every (group, value) pair, back in row order
+    _, first = np.unique(pairs, return_index=True)
+    first = np.sort(first)
+    pair_groups = codes[rows[first]]
+    order = np.argsort(pair_groups, kind='stable')
+    pair_groups = pair_groups[order]
+    # Label each pair by the group's own first value, not the column-wide one:
+    # factorize treats 5 and 5.0 (or True and 1) as equal but str() does not
+    strings = [str(value) for value in values.iloc[rows[first[order]]].tolist()]
+
+    joined = np.full(n_groups, '', dtype=object)
+    bounds = np.flatnonzero(np.diff(pair_groups)) + 1
+    starts = np.concatenate([[0], bounds]) if len(pair_groups) else np.array([], dtype=int)
+    ends = np.concatenate([bounds, [len(pair_groups)]]) if len(pair_groups) else starts
+    for group, start, end in zip(pair_groups[starts], starts, ends):
+        joined[group] = separator.join(strings[start:end])
+    return joined
+
+
+def pick_value(values, codes, n_groups, last=False):
+    """The first (or last) non-blank value per group; groups with none get NaN."""
+    rows = np.flatnonzero((codes >= 0) & values.notna().to_numpy())
+    if last:
+        rows = rows[::-1]
+    groups, position = np.unique(codes[rows], return_index=True)
+    picked = pd.Series(np.nan, index=range(n_groups), dtype=object)
+    picked.iloc[groups] = values.iloc[rows[position]].to_numpy(dtype=object)
+    return picked.infer_objects().to_numpy()
+
+
+def numeric_max(values, codes, n_groups):
+    """Largest numeric value per group; NaN where a group has no numbers."""
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    keep = (codes >= 0) & ~np.isnan(numbers)
+    result = np.full(n_groups, -np.inf)
+    np.maximum.at(result, codes[keep], numbers[keep])
+    result[np.isinf(result)] = np.nan
+    return result
+
+
+def aggregate_by(df, key='Name', policies=None, default='join', separator=', '):
+    """One row per distinct key (sorted, blank keys dropped), other columns combined by policy.
+
+    policies maps column -> one of POLICIES; other columns use default.
+    With the defaults this gives the same result as
+    df.groupby(key, as_index=False).agg(lambda x: ', '.join(map(str, x.dropna().unique()))).
+    """
+    policies = policies or {}
+    for column, policy in list(policies.items()) + [(None, default)]:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}' for column {column}. Use one of {POLICIES}.")
+
+    codes, keys = group_codes(df[key])
+    n_groups = len(keys)
+    columns = {key: keys}
+    for column in df.columns:
+        if column == key:
+            continue
+        values = df[column]
+        policy = policies.get(column, default)
+        if policy == 'join':
+            columns[column] = join_distinct(values, codes, n_groups, separator)
+        elif policy == 'max':
+            columns[column] = numeric_max(values, codes, n_groups)
+        else:
+            columns[column] = pick_value(values, codes, n_groups, last=policy == 'last')
+    return pd.DataFrame(columns)
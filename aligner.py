@@ -1,24 +1,29 @@
 import pandas as pd
 import os
+import shlex
+import time
+from concurrent.futures import ProcessPoolExecutor
+from frame_dtypes import compact_frame
+from name_matcher import merge_on_names, write_match_report
+from sidecar import read_frame, write_frame
+from exam_schema import is_wide_column
 
-def load_data(file_path):
+def load_data(file_path, usecols=None):
     file_path = clean_file_path(file_path)
     ext = os.path.splitext(file_path)[1].lower()
-    if ext in ['.xls', '.xlsx']:
-        return pd.read_excel(file_path)
-    elif ext == '.csv':
-        return pd.read_csv(file_path)
+    if ext in ['.xls', '.xlsx', '.csv']:
+        df = read_frame(file_path, usecols=usecols)
     else:
         raise ValueError("Unsupported file format. Please provide a .csv or .xls/.xlsx file.")
+    # Marks columns with absent tokens (AB, A, -) are kept as written so they reach the output
+    df = compact_frame(df, label=os.path.basename(file_path))
+    return df
+
+BASE_COLUMNS = {'Roll No', 'Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.'}
 
 def filter_columns(df):
-    # Define allowed columns including up to 100 exams and their total marks
-    allowed_columns = {'Roll No', 'Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.'}
-    allowed_columns.update({f'Exam{i}' for i in range(1, 101)})
-    allowed_columns.update({f'Total Marks{i}' for i in range(1, 101)})
-    
-    # Filter the DataFrame to keep only the allowed columns
-    filtered_df = df[[col for col in df.columns if col in allowed_columns]]
+    # Keep the base columns plus up to 100 exams and their total marks
+    filtered_df = df[[col for col in df.columns if col in BASE_COLUMNS or is_wide_column(col, ['Exam', 'Total Marks'])]]
     return filtered_df
 
 def rename_exam_columns(df):
@@ -26,22 +31,42 @@ def rename_exam_columns(df):
         df = df.rename(columns={'Exam': 'Exam1', 'Total Marks': 'Total Marks1'})
     return df
 
-def gather_contacts(data_folder):
-    contacts_df = pd.DataFrame()
+CONTACT_COLUMNS = ['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
+
+def load_contact_file(file_path):
+    """Read only the contact columns from one file and time the load."""
+    start = time.perf_counter()
+    df = load_data(file_path, usecols=CONTACT_COLUMNS)
+    return df, time.perf_counter() - start
+
+def gather_contacts(data_folder, max_workers=None):
+    file_names = []
     for filename in os.listdir(data_folder):
         file_path = os.path.join(data_folder, filename)
         if os.path.isdir(file_path) or filename.startswith('~') or filename.startswith('.'):
             continue
-        try:
-            current_df = load_data(file_path)
-            current_df = filter_columns(current_df)
-            required_columns = ['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
-            if all(column in current_df.columns for column in required_columns):
-                contacts_df = pd.concat([contacts_df, current_df[required_columns]], ignore_index=True)
-            else:
-                print(f"File '{filename}' does not contain the required columns and will be skipped.")
-        except Exception as e:
-            print(f"Error processing file '{filename}': {e}")
+        file_names.append(filename)
+
+    # Parse the workbooks in parallel, then concatenate once in folder order
+    frames = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(filename, executor.submit(load_contact_file, os.path.join(data_folder, filename)))
+                   for filename in file_names]
+        for filename, future in futures:
+            try:
+                current_df, load_time = future.result()
+                if all(column in current_df.columns for column in CONTACT_COLUMNS):
+                    frames.append(current_df[CONTACT_COLUMNS])
+                    print(f"Loaded contacts from '{filename}' in {load_time:.2f}s")
+                else:
+                    print(f"File '{filename}' does not contain the required columns and will be skipped.")
+            except Exception as e:
+                print(f"Error processing file '{filename}': {e}")
+
+    if frames:
+        contacts_df = pd.concat(frames, ignore_index=True)
+    else:
+        contacts_df = pd.DataFrame(columns=CONTACT_COLUMNS)
     contacts_df.drop_duplicates(subset=['Name'], keep='last', inplace=True)
     return contacts_df
 
@@ -50,26 +75,23 @@ def merge_contacts(names_file, contacts_df, output_file):
     names_df = rename_exam_columns(names_df)
     names_df = filter_columns(names_df)
     
-    merged_df = names_df.merge(
-        contacts_df[['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']],
-        on='Name', how='left'
+    # Match on normalised names so spacing, case or word order don't lose contacts
+    merged_df, match_report = merge_on_names(
+        names_df,
+        contacts_df[['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']]
     )
     
     output_dir = 'Output'
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, output_file)
     
-    if output_file.lower().endswith('.xlsx'):
-        merged_df.to_excel(output_path, index=False)
-    elif output_file.lower().endswith('.xls'):
-        merged_df.to_excel(output_path, index=False, engine='xlwt')
-    else:
-        merged_df.to_csv(output_path, index=False)
+    write_frame(merged_df, output_path)
     
     print(f"Data has been merged and saved to {output_path}")
+    write_match_report(match_report, output_path)
     return merged_df
 
-def merge_exam_data(merged_df, exam_file, exam_index):
+def prepare_exam_frame(exam_file, exam_index):
     exam_df = load_data(exam_file)
     print(f"Exam file columns: {exam_df.columns}")
     required_columns = ['Name', 'Exam', 'Total Marks']
@@ -81,17 +103,70 @@ def merge_exam_data(merged_df, exam_file, exam_index):
         'Total Marks': f'Total Marks{exam_index}'
     }
     exam_df = exam_df.rename(columns=new_columns)
-    merged_df = merged_df.merge(exam_df[['Name'] + list(new_columns.values())], on='Name', how='left')
-    
+    return exam_df[['Name'] + list(new_columns.values())]
+
+def order_exam_columns(merged_df):
     # Ensure proper column ordering
     exam_columns = [col for col in merged_df.columns if col.startswith('Exam') or col.startswith('Total Marks')]
     exam_columns_sorted = sorted(exam_columns, key=lambda x: (int(''.join(filter(str.isdigit, x))), x))
     
     contact_columns = ['Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
     other_columns = ['Roll No', 'Name'] + [col for col in merged_df.columns if col not in exam_columns + contact_columns + ['Roll No', 'Name']]
-    merged_df = merged_df[other_columns + exam_columns_sorted + contact_columns if any(col in merged_df.columns for col in contact_columns) else []]
-    
-    return merged_df
+    return merged_df[other_columns + exam_columns_sorted + contact_columns if any(col in merged_df.columns for col in contact_columns) else []]
+
+def merge_exam_data(merged_df, exam_file, exam_index):
+    exam_df = prepare_exam_frame(exam_file, exam_index)
+    merged_df = merged_df.merge(exam_df, on='Name', how='left')
+    return order_exam_columns(merged_df)
+
+def merge_exam_batch(merged_df, exam_files, start_index):
+    """Merge many exam files in one pass and return (merged_df, exams added).
+
+    Each exam is indexed by Name (last row wins for repeated names), all of
+    them are aligned to the main file's names with a single concat/reindex
+    and the columns are ordered once at the end.
+    """
+    exam_frames = []
+    for exam_file in exam_files:
+        try:
+            exam_df = prepare_exam_frame(exam_file, start_index + len(exam_frames))
+        except Exception as e:
+            print(f"Error processing exam file '{exam_file}': {e}")
+            continue
+        exam_df = exam_df.dropna(subset=['Name']).drop_duplicates(subset=['Name'], keep='last')
+        exam_frames.append(exam_df.set_index('Name'))
+        print(f"Indexed exam file '{exam_file}' as Exam{start_index + len(exam_frames) - 1}")
+
+    if not exam_frames:
+        return merged_df, 0
+    exams = pd.concat(exam_frames, axis=1).reindex(merged_df['Name'])
+    merged_df = pd.concat([merged_df.reset_index(drop=True), exams.reset_index(drop=True)], axis=1)
+    return order_exam_columns(merged_df), len(exam_frames)
+
+def expand_exam_files(line):
+    """Split a line of dropped exam files (or a single folder) into paths."""
+    whole = clean_file_path(line)
+    if os.path.isfile(whole):
+        # One dropped file whose name has spaces or an apostrophe
+        return [whole]
+    try:
+        parts = shlex.split(line, posix=False)
+    except ValueError:
+        # An unbalanced quote, e.g. D'Souza marks.xlsx: take the whole line as one path
+        parts = [line]
+    # Drop the PowerShell '&' prefix and any token that is only quotes
+    paths = [path for path in (clean_file_path(part) for part in parts) if path]
+    if len(paths) == 1 and os.path.isdir(paths[0]):
+        folder = paths[0]
+        return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+                if name.lower().endswith(('.xlsx', '.xls', '.csv')) and not name.startswith('~')]
+    return paths
+
+def write_output(merged_df, output_file):
+    os.makedirs('Output', exist_ok=True)
+    output_path = os.path.join('Output', output_file)
+    write_frame(merged_df, output_path)
+    return output_path
 
 def clean_file_path(file_path):
     # Remove leading & trailing spaces and special characters
@@ -130,13 +205,8 @@ def main():
         exam_file = clean_file_path(exam_file)
         try:
             merged_df = merge_exam_data(merged_df, exam_file, exam_index)
-            if output_file.lower().endswith('.xlsx'):
-                merged_df.to_excel(os.path.join('Output', output_file), index=False)
-            elif output_file.lower().endswith('.xls'):
-                merged_df.to_excel(os.path.join('Output', output_file), index=False, engine='xlwt')
-            else:
-                merged_df.to_csv(os.path.join('Output', output_file), index=False)
-            print(f"Exam data has been merged and saved to {os.path.join('Output', output_file)}")
+            output_path = write_output(merged_df, output_file)
+            print(f"Exam data has been merged and saved to {output_path}")
         except Exception as e:
             print(f"Error processing exam file '{exam_file}': {e}")
             return
@@ -144,19 +214,21 @@ def main():
     exam_index = len([col for col in merged_df.columns if col.startswith('Exam')]) + 1
 
     while True:
-        more_exam_data = input("Do you want to add data for another exam? (yes/no): ").strip().lower()
-        if more_exam_data == 'yes':
+        more_exam_data = input("Do you want to add data for another exam? (yes/no/batch): ").strip().lower()
+        if more_exam_data == 'batch':
+            exam_files = expand_exam_files(input("Drag and drop all the exam files (or a folder of them) into the terminal: "))
+            merged_df, added = merge_exam_batch(merged_df, exam_files, exam_index)
+            if added:
+                output_path = write_output(merged_df, output_file)
+                print(f"{added} exam(s) have been merged and saved to {output_path}")
+                exam_index += added
+        elif more_exam_data == 'yes':
             exam_file = input("Drag and drop the exam file into the terminal: ").strip()
             exam_file = clean_file_path(exam_file)
             try:
                 merged_df = merge_exam_data(merged_df, exam_file, exam_index)
-                if output_file.lower().endswith('.xlsx'):
-                    merged_df.to_excel(os.path.join('Output', output_file), index=False)
-                elif output_file.lower().endswith('.xls'):
-                    merged_df.to_excel(os.path.join('Output', output_file), index=False, engine='xlwt')
-                else:
-                    merged_df.to_csv(os.path.join('Output', output_file), index=False)
-                print(f"Exam data has been merged and saved to {os.path.join('Output', output_file)}")
+                output_path = write_output(merged_df, output_file)
+                print(f"Exam data has been merged and saved to {output_path}")
                 
                 exam_index += 1
             except Exception as e:
@@ -164,7 +236,7 @@ def main():
         elif more_exam_data == 'no':
             break
         else:
-            print("Invalid input. Please enter 'yes' or 'no'.")
+            print("Invalid input. Please enter 'yes', 'no' or 'batch'.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+import heapq
+import math
+
+import numpy as np
+
+METHODS = ['equal', 'hamilton', 'dhondt']
+
+
+def super40_priority(names):
+    """Order in which SUPER40 hands out leftover seats: classes 1, 2, 3, 5, 4, 6, ..."""
+    names = sorted(names)
+    return names[:3] + names[4:5] + names[3:4] + names[5:]
+
+
+def seat_bounds(sizes, minimum=0, maximum=None):
+    """Per-class (min, max) seats from an int or a {class: seats} dict for each bound."""
+    def bound(value, name, default):
+        if value is None:
+            return default
+        if isinstance(value, dict):
+            return value.get(name, default)
+        return value
+    return {name: (bound(minimum, name, 0), bound(maximum, name, math.inf)) for name in sizes}
+
+
+def equal_shares(sizes, seats, priority=None):
+    """seats // n per class; the remainder goes one each in priority order (default: name order)."""
+    names = sorted(sizes)
+    quotas = {name: seats // len(names) for name in names}
+    priority = priority or names
+    for i in range(seats - sum(quotas.values())):
+        quotas[priority[i % len(priority)]] += 1
+    return quotas
+
+
+def hamilton(sizes, seats):
+    """Largest-remainder apportionment.
+
+    Each class gets the floor of its exact share; leftover seats go to the
+    largest remainders, ties broken by larger class, then class name.
+    """
+    total = sum(sizes.values())
+    if total == 0:
+        return equal_shares(sizes, seats)
+    shares = {name: size * seats / total for name, size in sizes.items()}
+    quotas = {name: int(math.floor(share)) for name, share in shares.items()}
+    leftover = seats - sum(quotas.values())
+    order = sorted(sizes, key=lambda name: (-(shares[name] - quotas[name]), -sizes[name], name))
+    for name in order[:leftover]:
+        quotas[name] += 1
+    return quotas
+
+
+def dhondt(sizes, seats, start=None, caps=None):
+    """Highest-averages (D'Hondt) apportionment with a heap of size / (seats + 1).
+
+    start gives seats already held (e.g. minimums); classes at their cap stop
+    receiving seats. Ties go to the larger class, then class name.
+    """
+    quotas = dict(start) if start else {name: 0 for name in sizes}
+    caps = caps or {}
+    heap = [(-sizes[name] / (quotas[name] + 1), -sizes[name], name) for name in sorted(sizes)
+            if quotas[name] < caps.get(name, math.inf)]
+    heapq.heapify(heap)
+    for _ in range(seats - sum(quotas.values())):
+        if not heap:
+            break
+        _, _, name = heapq.heappop(heap)
+        quotas[name] += 1
+        if quotas[name] < caps.get(name, math.inf):
+            heapq.heappush(heap, (-sizes[name] / (quotas[name] + 1), -sizes[name], name))
+    return quotas
+
+
+def apportion(sizes, seats, method='hamilton', minimum=0, maximum=None, priority=None):
+    """Split seats between classes ({class: students}) by method within per-class bounds.
+
+    Classes pinned at a bound keep it and the remaining seats are
+    re-apportioned among the others until every class is within bounds.
+    Raises ValueError when the minimums alone exceed the seats; when the
+    maximums cannot absorb every seat, each class is filled to its maximum.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown apportionment method '{method}'. Use one of {METHODS}.")
+    if not sizes:
+        return {}
+    bounds = seat_bounds(sizes, minimum, maximum)
+    if sum(low for low, _ in bounds.values()) > seats:
+        raise ValueError(f"Per-class minimums need more than {seats} seats.")
+    if sum(high for _, high in bounds.values()) <= seats:
+        return {name: int(high) for name, (_, high) in bounds.items()}
+
+    if method == 'dhondt':
+        start = {name: low for name, (low, _) in bounds.items()}
+        caps = {name: high for name, (_, high) in bounds.items()}
+        return dhondt(sizes, seats, start, caps)
+
+    pinned = {}
+    while True:
+        free = {name: size for name, size in sizes.items() if name not in pinned}
+        if not free:
+            return pinned
+        remaining = seats - sum(pinned.values())
+        if method == 'equal':
+            quotas = equal_shares(free, remaining, [name for name in priority or sorted(sizes) if name in free])
+        else:
+            quotas = hamilton(free, remaining)
+        violations = {name: min(max(quota, bounds[name][0]), bounds[name][1])
+                      for name, quota in quotas.items()
+                      if not bounds[name][0] <= quota <= bounds[name][1]}
+        if not violations:
+            quotas.update(pinned)
+            return quotas
+        pinned.update(violations)
+
+
+def select_top_per_class(df, quotas, score_column, class_column='CLASS'):
+    """Top quotas[class] rows of each class by score, in O(n log k).
+
+    Missing scores are never selected; equal scores keep sheet order, as
+    with DataFrame.nlargest(keep='first').
+    """
+    scores = df[score_column].to_numpy(dtype=np.float64)
+    positions = {}
+    for position, name in enumerate(df[class_column].to_numpy(dtype=object)):
+        if not np.isnan(scores[position]):
+            positions.setdefault(name, []).append(position)
+    selected = []
+    for name in sorted(positions, key=str):
+        selected.extend(heapq.nlargest(quotas.get(name, 0), positions[name], key=scores.__getitem__))
+    return df.iloc[selected]
@@ -1,7 +1,10 @@
 import csv
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import glob
 import os
 import re
+import time
 import openpyxl
 import sys  
 
@@ -189,77 +192,160 @@ def merge_data(attendance_data, contact_info):
             merged_data[emp_code].update(contact_info[emp_code])
     return merged_data
 
-def write_merged_data(merged_data, output_file):
-    if output_file.lower().endswith('.xlsx'):
-        workbook = openpyxl.Workbook()
-        sheet = workbook.active
+CONTACT_COLUMNS = ['EMP CODE', 'NAME', 'MOTHER NO', 'FATHER NO', 'SELF NO']
 
-        # Get all unique time columns from the attendance data
-        all_times = sorted(set(
-            time
-            for data in merged_data.values()
-            for time in data.get('Attendance', {}).keys()
-            if time is not None
-        ))
+def plan_columns(merged_data):
+    """Compute the output column plan once for all rows."""
+    # Get all unique time columns from the attendance data
+    all_times = sorted(set(
+        time
+        for data in merged_data.values()
+        for time in data.get('Attendance', {}).keys()
+        if time is not None
+    ))
+    # Define headers without summary columns
+    return CONTACT_COLUMNS + all_times, all_times
 
-        # Define headers without summary columns
-        headers = ['EMP CODE', 'NAME', 'MOTHER NO', 'FATHER NO', 'SELF NO'] + all_times
+def iter_merged_rows(merged_data, all_times):
+    """Yield one output row per employee without materialising the table."""
+    for emp_code, data in merged_data.items():
+        attendance = data.get('Attendance', {})
+        yield [
+            emp_code,
+            data.get('NAME', ''),
+            data.get('MOTHER NO', ''),
+            data.get('FATHER NO', ''),
+            data.get('SELF NO', '')
+        ] + [attendance.get(time, '') for time in all_times]
 
-        sheet.append(headers)
+def write_merged_data(merged_data, output_file):
+    headers, all_times = plan_columns(merged_data)
+    rows = iter_merged_rows(merged_data, all_times)
 
-        for emp_code, data in merged_data.items():
-            row = [
-                emp_code,
-                data.get('NAME', ''),
-                data.get('MOTHER NO', ''),
-                data.get('FATHER NO', ''),
-                data.get('SELF NO', '')
-            ]
-            
-            # Add attendance data
-            for time in all_times:
-                row.append(data.get('Attendance', {}).get(time, ''))
-            
+    if output_file.lower().endswith('.xlsx'):
+        # Write-only mode streams rows to disk instead of keeping every cell in memory
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(headers)
+        for row in rows:
             sheet.append(row)
-
         workbook.save(output_file)
     else:  # Write as CSV
         with open(output_file, 'w', newline='') as file:
             writer = csv.writer(file)
-            
-            # Get all unique time columns from the attendance data
-            all_times = sorted(set(
-                time
-                for data in merged_data.values()
-                for time in data.get('Attendance', {}).keys()
-                if time is not None
-            ))
-            
-            # Define headers without summary columns
-            headers = ['EMP CODE', 'NAME', 'MOTHER NO', 'FATHER NO', 'SELF NO'] + all_times
             writer.writerow(headers)
-            
-            for emp_code, data in merged_data.items():
-                row = [
-                    emp_code,
-                    data.get('NAME', ''),
-                    data.get('MOTHER NO', ''),
-                    data.get('FATHER NO', ''),
-                    data.get('SELF NO', '')
-                ]
-                
-                # Add attendance data
-                for time in all_times:
-                    row.append(data.get('Attendance', {}).get(time, ''))
-                
-                writer.writerow(row)
+            writer.writerows(rows)
 
     print(f"Merged data has been written to {output_file}")
 
+LONG_COLUMNS = CONTACT_COLUMNS + ['DATE', 'TIME', 'SOURCE FILE']
+
+def expand_batch_inputs(pattern):
+    """Resolve a directory or glob pattern to the attendance files it contains."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*')
+    files = []
+    for file_path in sorted(glob.glob(pattern)):
+        file_name = os.path.basename(file_path)
+        if file_name.startswith('~') or file_name.startswith('.'):
+            continue
+        if os.path.isfile(file_path) and file_name.lower().endswith(('.xlsx', '.csv')):
+            files.append(file_path)
+    return files
+
+def is_batch_input(path):
+    # An existing file is never a pattern, even if its name has [ or ? in it
+    if os.path.isfile(path):
+        return False
+    return os.path.isdir(path) or any(char in path for char in '*?[')
+
+def parse_attendance_file(file_path):
+    """Process-pool worker: parse one device export and time it."""
+    start = time.perf_counter()
+    attendance_data = read_attendance_data(file_path)
+    return file_path, attendance_data, time.perf_counter() - start
+
+def iter_long_rows(merged_data, file_path):
+    """Yield one (contact..., DATE, TIME, SOURCE FILE) row per punch."""
+    # Imported here so the pool workers don't pay for pandas on start-up
+    from attendance_analytics import date_from_filename
+
+    file_name = os.path.basename(file_path)
+    date = date_from_filename(file_name)
+    date = date.strftime('%d-%m-%Y') if date is not None else ''
+    for emp_code, data in merged_data.items():
+        contact = [
+            emp_code,
+            data.get('NAME', ''),
+            data.get('MOTHER NO', ''),
+            data.get('FATHER NO', ''),
+            data.get('SELF NO', '')
+        ]
+        for punch in data.get('Attendance', {}).values():
+            yield contact + [date, punch, file_name]
+
+def merge_batch(input_files, output_folder='Output', combined=False, workers=None):
+    """Merge many attendance exports against one shared contact map.
+
+    Files are parsed in a process pool. With combined=True every punch is
+    written to a single long-format ATTENDANCE_MERGER_COMBINED file,
+    otherwise each input gets its own "<name>_merged.xlsx".
+    """
+    os.makedirs(output_folder, exist_ok=True)
+
+    start = time.perf_counter()
+    contact_info = read_all_contact_files()
+    contacts_time = time.perf_counter() - start
+    print(f"Loaded {len(contact_info)} contacts in {contacts_time:.2f}s")
+
+    if combined:
+        combined_file = os.path.join(output_folder, 'ATTENDANCE_MERGER_COMBINED.xlsx')
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(LONG_COLUMNS)
+
+    timings = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_path, attendance_data, parse_time in executor.map(parse_attendance_file, input_files):
+            start = time.perf_counter()
+            merged_data = merge_data(attendance_data, contact_info)
+            if combined:
+                for row in iter_long_rows(merged_data, file_path):
+                    sheet.append(row)
+            else:
+                stem = os.path.splitext(os.path.basename(file_path))[0]
+                write_merged_data(merged_data, os.path.join(output_folder, f"{stem}_merged.xlsx"))
+            timings.append((os.path.basename(file_path), len(merged_data), parse_time,
+                            time.perf_counter() - start))
+
+    if combined:
+        workbook.save(combined_file)
+        print(f"Combined long-format data has been written to {combined_file}")
+
+    print("\nPer-file timings:")
+    print(f"{'File':<40} {'Employees':>9} {'Parse (s)':>10} {'Merge+Write (s)':>16}")
+    for file_name, employees, parse_time, write_time in timings:
+        print(f"{file_name[:40]:<40} {employees:>9} {parse_time:>10.2f} {write_time:>16.2f}")
+    total_parse = sum(t[2] for t in timings)
+    total_write = sum(t[3] for t in timings)
+    print(f"{'TOTAL':<40} {sum(t[1] for t in timings):>9} {total_parse:>10.2f} {total_write:>16.2f}")
+    return timings
+
 def main():
     print("Welcome to the Attendance Merger!")
     
-    attendance_file = get_file_path("Please drag and drop the attendance file (CSV or XLSX):")
+    attendance_file = get_file_path("Please drag and drop the attendance file (CSV or XLSX), or a folder / glob pattern for batch mode:")
+
+    if is_batch_input(attendance_file):
+        input_files = expand_batch_inputs(attendance_file)
+        if not input_files:
+            print(f"No CSV or XLSX files found for: {attendance_file}")
+            return
+        print(f"\nBatch mode: {len(input_files)} file(s) found.")
+        combined = input("Write one combined long-format file instead of one file per input? (yes/no): ").strip().lower() == 'yes'
+        merge_batch(input_files, combined=combined)
+        print("The merged files are in the Output folder.")
+        return
     
     output_file = 'ATTENDANCE_MERGER.xlsx'
     
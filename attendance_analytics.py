@@ -0,0 +1,282 @@
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# Daily sheets carry their date in the file name, e.g. "ATTENDANCE 04-12-2024.xlsx"
+DATE_PATTERNS = [
+    (re.compile(r'(\d{1,2})[-_.](\d{1,2})[-_.](\d{4})'), ('day', 'month', 'year')),
+    (re.compile(r'(\d{4})[-_.](\d{1,2})[-_.](\d{1,2})'), ('year', 'month', 'day')),
+]
+
+BASE_COLUMNS = ['EMP CODE', 'NAME']
+DEFAULT_LATE_AFTER = '09:30'
+DEFAULT_LOW_ATTENDANCE = 75.0
+
+
+def clean_file_path(file_path):
+    # Remove leading & trailing spaces and drag-and-drop artifacts
+    return file_path.strip().strip('\'"& ')
+
+
+def date_from_filename(file_name):
+    """Extract the attendance date from a daily file name, or None."""
+    for pattern, order in DATE_PATTERNS:
+        match = pattern.search(file_name)
+        if match:
+            parts = dict(zip(order, map(int, match.groups())))
+            try:
+                return pd.Timestamp(year=parts['year'], month=parts['month'], day=parts['day'])
+            except ValueError:
+                return None
+    return None
+
+
+def time_to_minutes(times):
+    """Convert 'HH:MM' / 'HH:MM:SS' punch strings to minutes after midnight."""
+    parts = times.astype(str).str.extract(r'(\d{1,2}):(\d{2})')
+    return pd.to_numeric(parts[0], errors='coerce') * 60 + pd.to_numeric(parts[1], errors='coerce')
+
+
+def read_daily_sheet(file_path, date):
+    """Read one merged daily sheet into long (EMP CODE, NAME, DATE, TIME) rows."""
+    if file_path.lower().endswith('.csv'):
+        df = pd.read_csv(file_path, dtype=str)
+    else:
+        df = pd.read_excel(file_path, dtype=str)
+    df.columns = df.columns.astype(str).str.strip()
+
+    # Already long format (e.g. the merger's combined batch output)
+    if 'DATE' in df.columns and 'TIME' in df.columns:
+        long_df = df[BASE_COLUMNS + ['DATE', 'TIME']].copy()
+        long_df['DATE'] = pd.to_datetime(long_df['DATE'], dayfirst=True, errors='coerce')
+        return long_df.dropna(subset=['EMP CODE', 'DATE'])
+
+    time_columns = [col for col in df.columns if col.startswith('Time')]
+    if 'EMP CODE' not in df.columns or not time_columns:
+        print(f"File '{os.path.basename(file_path)}' is not a merged attendance sheet and will be skipped.")
+        return pd.DataFrame(columns=BASE_COLUMNS + ['DATE', 'TIME'])
+
+    if 'NAME' not in df.columns:
+        df['NAME'] = ''
+    long_df = df.melt(id_vars=BASE_COLUMNS, value_vars=time_columns, value_name='TIME')
+    long_df = long_df.drop(columns='variable').dropna(subset=['EMP CODE', 'TIME'])
+    long_df['DATE'] = date
+    return long_df[BASE_COLUMNS + ['DATE', 'TIME']]
+
+
+def load_attendance_history(history_folder):
+    """Load every dated daily sheet in a folder into one long punch table."""
+    frames = []
+    for file_name in sorted(os.listdir(history_folder)):
+        file_path = os.path.join(history_folder, file_name)
+        if os.path.isdir(file_path) or file_name.startswith('~') or file_name.startswith('.'):
+            continue
+        if not file_name.lower().endswith(('.xlsx', '.xls', '.csv')):
+            continue
+        date = date_from_filename(file_name)
+        try:
+            frame = read_daily_sheet(file_path, date)
+        except Exception as e:
+            print(f"Error processing file '{file_name}': {e}")
+            continue
+        if date is None and frame['DATE'].isna().all():
+            print(f"File '{file_name}' has no date in its name and will be skipped.")
+            continue
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=BASE_COLUMNS + ['DATE', 'TIME'])
+    punches = pd.concat(frames, ignore_index=True)
+    punches['EMP CODE'] = punches['EMP CODE'].astype(str).str.strip()
+    punches['DATE'] = pd.to_datetime(punches['DATE']).dt.normalize()
+    return punches
+
+
+def read_class_map(data_folder='Data'):
+    """Map EMP CODE to CLASS (or BATCH) from the contact sheets, where present."""
+    class_map = {}
+    if not os.path.isdir(data_folder):
+        return pd.Series(class_map, dtype=object)
+    for file_name in os.listdir(data_folder):
+        file_path = os.path.join(data_folder, file_name)
+        if file_name.startswith('~') or file_name.startswith('.'):
+            continue
+        try:
+            if file_name.lower().endswith('.xlsx'):
+                df = pd.read_excel(file_path, dtype=str)
+            elif file_name.lower().endswith('.csv'):
+                df = pd.read_csv(file_path, dtype=str)
+            else:
+                continue
+        except Exception as e:
+            print(f"Error processing file '{file_name}': {e}")
+            continue
+        df.columns = df.columns.astype(str).str.strip().str.upper()
+        class_column = next((col for col in ('CLASS', 'BATCH') if col in df.columns), None)
+        if 'EMP CODE' in df.columns and class_column:
+            rows = df[['EMP CODE', class_column]].dropna()
+            class_map.update(zip(rows['EMP CODE'].str.strip(), rows[class_column].str.strip()))
+    return pd.Series(class_map, dtype=object)
+
+
+def run_lengths(keys, flags):
+    """Run-length encode a boolean array that is sorted by key.
+
+    Returns (key, flag, length) arrays with one entry per run; a run never
+    crosses a key boundary.
+    """
+    n = len(flags)
+    if n == 0:
+        empty = np.array([], dtype=np.int64)
+        return keys[:0], flags[:0], empty
+    boundary = np.empty(n, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (flags[1:] != flags[:-1]) | (keys[1:] != keys[:-1])
+    starts = np.flatnonzero(boundary)
+    lengths = np.diff(np.append(starts, n))
+    return keys[starts], flags[starts], lengths
+
+
+class AttendanceAnalytics:
+    """Attendance %, absence streaks and late counts over a punch history."""
+
+    def __init__(self, punches, class_map=None, late_after=DEFAULT_LATE_AFTER):
+        punches = punches.dropna(subset=['EMP CODE', 'DATE'])
+        self.late_after = int(time_to_minutes(pd.Series([late_after])).iloc[0])
+
+        # One row per student per day: present, first punch
+        punches = punches.assign(MINUTES=time_to_minutes(punches['TIME']))
+        daily = punches.groupby(['EMP CODE', 'DATE'], sort=True).agg(
+            NAME=('NAME', 'first'), FIRST_IN=('MINUTES', 'min')
+        ).reset_index()
+        daily['LATE'] = daily['FIRST_IN'] > self.late_after
+        daily['PERIOD'] = daily['DATE'].dt.to_period('M')
+        self.daily = daily
+
+        self.names = daily.groupby('EMP CODE')['NAME'].last()
+        self.class_map = class_map if class_map is not None else pd.Series(dtype=object)
+        self._cache = {}
+
+    @property
+    def periods(self):
+        return sorted(self.daily['PERIOD'].unique())
+
+    def student_metrics(self, period):
+        """Per-student metrics for one month (a pandas Period or 'YYYY-MM').
+
+        Only students with attendance recorded in that month are included, so
+        a student who joined later or has left isn't counted absent for it.
+        """
+        period = pd.Period(period, freq='M')
+        if period in self._cache:
+            return self._cache[period]
+
+        month = self.daily[self.daily['PERIOD'] == period]
+        # Working days are the days on which any attendance was recorded
+        working_days = np.sort(month['DATE'].unique())
+        students = np.sort(month['EMP CODE'].unique())
+        if len(working_days) == 0:
+            metrics = pd.DataFrame(columns=['EMP CODE', 'NAME', 'CLASS', 'PERIOD', 'WORKING DAYS',
+                                            'PRESENT DAYS', 'ATTENDANCE %', 'LATE COUNT',
+                                            'LONGEST ABSENCE STREAK', 'CURRENT ABSENCE STREAK'])
+            self._cache[period] = metrics
+            return metrics
+
+        # Dense students x working-days presence grid, flattened in (student, date) order
+        student_idx = np.searchsorted(students, month['EMP CODE'].to_numpy())
+        day_idx = np.searchsorted(working_days, month['DATE'].to_numpy())
+        present = np.zeros((len(students), len(working_days)), dtype=bool)
+        present[student_idx, day_idx] = True
+
+        present_days = present.sum(axis=1)
+        late_counts = np.bincount(student_idx, weights=month['LATE'].to_numpy(dtype=float),
+                                  minlength=len(students)).astype(np.int64)
+
+        # Absence streaks via run-length encoding over each student's sorted days
+        keys = np.repeat(np.arange(len(students)), len(working_days))
+        run_keys, run_flags, run_lengths_ = run_lengths(keys, present.ravel())
+        absent_runs = ~run_flags
+        longest = np.zeros(len(students), dtype=np.int64)
+        np.maximum.at(longest, run_keys[absent_runs], run_lengths_[absent_runs])
+        current = np.zeros(len(students), dtype=np.int64)
+        last_run = np.append(run_keys[1:] != run_keys[:-1], True)
+        current[run_keys[last_run & absent_runs]] = run_lengths_[last_run & absent_runs]
+
+        metrics = pd.DataFrame({
+            'EMP CODE': students,
+            'NAME': self.names.reindex(students).to_numpy(),
+            'CLASS': self.class_map.reindex(students).to_numpy(),
+            'PERIOD': str(period),
+            'WORKING DAYS': len(working_days),
+            'PRESENT DAYS': present_days,
+            'ATTENDANCE %': np.round(present_days / len(working_days) * 100, 2),
+            'LATE COUNT': late_counts,
+            'LONGEST ABSENCE STREAK': longest,
+            'CURRENT ABSENCE STREAK': current,
+        })
+        self._cache[period] = metrics
+        return metrics
+
+    def student_report(self, periods=None):
+        periods = self.periods if periods is None else periods
+        frames = [self.student_metrics(period) for period in periods]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def class_report(self, periods=None, low_attendance=DEFAULT_LOW_ATTENDANCE):
+        """Class-wise monthly summary for the given months (default: all)."""
+        report = self.student_report(periods)
+        if report.empty:
+            return report
+        report = report.assign(CLASS=report['CLASS'].fillna('UNASSIGNED'),
+                               LOW=report['ATTENDANCE %'] < low_attendance)
+        return report.groupby(['CLASS', 'PERIOD'], sort=True).agg(
+            STUDENTS=('EMP CODE', 'size'),
+            AVG_ATTENDANCE=('ATTENDANCE %', 'mean'),
+            BELOW_THRESHOLD=('LOW', 'sum'),
+            LATE_ARRIVALS=('LATE COUNT', 'sum'),
+            LONGEST_STREAK=('LONGEST ABSENCE STREAK', 'max'),
+        ).round(2).reset_index().rename(columns={
+            'AVG_ATTENDANCE': 'AVG ATTENDANCE %',
+            'BELOW_THRESHOLD': f'BELOW {low_attendance:g}%',
+            'LATE_ARRIVALS': 'LATE ARRIVALS',
+            'LONGEST_STREAK': 'LONGEST ABSENCE STREAK',
+        })
+
+
+def main():
+    print("Welcome to the Attendance Analytics report!")
+    history_folder = clean_file_path(
+        input("Drag and drop the folder of daily attendance sheets (Enter for 'Attendance'): ") or 'Attendance')
+    if not os.path.isdir(history_folder):
+        print(f"Folder not found: {history_folder}")
+        return
+    late_after = input(f"Late after (HH:MM, Enter for {DEFAULT_LATE_AFTER}): ").strip() or DEFAULT_LATE_AFTER
+
+    start = time.perf_counter()
+    punches = load_attendance_history(history_folder)
+    if punches.empty:
+        print("No dated attendance sheets found.")
+        return
+    analytics = AttendanceAnalytics(punches, read_class_map('Data'), late_after)
+    students = analytics.student_report()
+    classes = analytics.class_report()
+
+    output_dir = 'Output'
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, 'ATTENDANCE_ANALYTICS.xlsx')
+    with pd.ExcelWriter(output_path) as writer:
+        classes.to_excel(writer, sheet_name='Class Summary', index=False)
+        students.to_excel(writer, sheet_name='Student Monthly', index=False)
+
+    print(f"{len(analytics.periods)} month(s), {students['EMP CODE'].nunique()} students "
+          f"processed in {time.perf_counter() - start:.2f}s")
+    print(f"Attendance analytics saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
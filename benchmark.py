@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import glob
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from synthetic_data import generate
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks')
+
+
+def load_script(file_name, module_name):
+    """Import a repo script by file name (several have spaces in their names)."""
+    path = os.path.join(REPO_DIR, file_name)
+    # An explicit loader, since 'OBJ SUB.PY' and 'TP.PY' have upper-case extensions
+    spec = importlib.util.spec_from_file_location(module_name, path, loader=importlib.machinery.SourceFileLoader(module_name, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def stage_attendance_merger():
+    merger = load_script('attendance merger.py', 'attendance_merger')
+    inputs = merger.expand_batch_inputs('Log Records')
+    merger.merge_batch(inputs, output_folder=os.path.join('Output', 'attendance'), combined=True)
+
+
+def stage_attendance_analytics():
+    import attendance_analytics
+    punches = attendance_analytics.load_attendance_history(os.path.join('Output', 'attendance'))
+    attendance_analytics.AttendanceAnalytics(punches, attendance_analytics.read_class_map('Data')).class_report()
+
+
+def aligner_stage(file_name, exam_type):
+    aligner = load_script(file_name, file_name.replace(' ', '_')[:-3])
+    contacts_df = aligner.gather_contacts('Data')
+    merged_df = aligner.merge_contacts(glob.glob('roster.*')[0], contacts_df, 'aligned.xlsx')
+    exam_files = sorted(glob.glob(os.path.join('Evalbee', f'11TH {exam_type} *.xlsx')))
+    merged_df, _ = aligner.merge_exam_batch(merged_df, exam_files, 1)
+    aligner.write_output(merged_df, 'aligned.xlsx')
+
+
+def stage_aligner():
+    aligner_stage('aligner.py', 'JEE')
+
+
+def stage_aligner_report():
+    aligner_stage('aligner_report.py', 'GAT')
+
+
+def stage_new_aligner():
+    aligner = load_script('new aligner.py', 'new_aligner')
+    output_folder = os.path.join('Output', 'evalbee')
+    os.makedirs(output_folder, exist_ok=True)
+    catalog = aligner.catalog_evalbee('Evalbee')
+    frames = []
+    for grade in aligner.GRADES:
+        for keywords in aligner.EXAM_TYPES:
+            merged_file, merged_df = aligner.merge_group(
+                aligner.group_catalog(catalog, grade, keywords), grade, keywords, output_folder)
+            if merged_file:
+                frames.append(merged_df)
+    aligner.append_all_files(frames, output_folder, 'Data')
+
+
+def stage_merger():
+    import merger
+    merger.merge_excel_files(sorted(glob.glob(os.path.join('merger', '*.xlsx'))), os.path.join('Output', 'merger'))
+
+
+def stage_file_combiner():
+    import file_combiner
+    file_combiner.process_folder('aligner')
+
+
+def stage_obj_sub():
+    obj_sub = load_script('OBJ SUB.PY', 'obj_sub')
+    obj_sub.merge_files(glob.glob('roster.*')[0], glob.glob('results_wide.*')[0], 'obj_sub.xlsx')
+
+
+def stage_super40_rank():
+    sup40 = load_script('sup40 rank.py', 'sup40_rank')
+    df = sup40.process_exam_data(glob.glob('super40.*')[0])
+    sup40.select_top_students(df)
+
+
+def stage_ranking_engine():
+    import ranking_engine
+    from sidecar import read_frame
+    df = read_frame(glob.glob('super40.*')[0])
+    engine = ranking_engine.RankingEngine(df, ranking_engine.super40_categories(df))
+    for top_k in (3, 4, 5):
+        engine.rank(ranking_engine.SUPER40_PERCENTAGE._replace(top_k=top_k))
+
+
+def stage_objective_messages():
+    from sidecar import read_frame
+    obwhatsend = load_script('obwhatsend.py', 'obwhatsend')
+    df = read_frame(glob.glob('results_wide.*')[0])
+    df.columns = df.columns.str.strip()
+    obwhatsend.process_data(df)
+
+
+def stage_subjective_messages():
+    from sidecar import read_frame
+    subwhatsend = load_script('subwhatsend.py', 'subwhatsend')
+    df = read_frame(glob.glob('subjective.*')[0])
+    df.columns = df.columns.str.strip()
+    subwhatsend.process_data(df)
+
+
+# (name, stage, setup): setup prepares the stage's inputs and is not timed
+STAGES = [
+    ('attendance_merger', stage_attendance_merger, None),
+    ('attendance_analytics', stage_attendance_analytics, stage_attendance_merger),
+    ('aligner', stage_aligner, None),
+    ('aligner_report', stage_aligner_report, None),
+    ('new_aligner', stage_new_aligner, None),
+    ('merger', stage_merger, None),
+    ('file_combiner', stage_file_combiner, None),
+    ('obj_sub', stage_obj_sub, None),
+    ('super40_rank', stage_super40_rank, None),
+    ('ranking_engine', stage_ranking_engine, None),
+    ('objective_messages', stage_objective_messages, None),
+    ('subjective_messages', stage_subjective_messages, None),
+]
+
+
+def fresh_copy(data_dir, work_dir, setup=None):
+    """Start from an untouched copy of the data: no outputs, caches or sidecars."""
+    os.chdir(data_dir)
+    if os.path.exists(work_dir):
+        shutil.rmtree(work_dir)
+    shutil.copytree(data_dir, work_dir)
+    os.chdir(work_dir)
+    if setup:
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup()
+
+
+def timed(stage, trace=False):
+    """Run a stage quietly; returns (seconds, peak MB or None)."""
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stage()
+        return time.perf_counter() - start, (tracemalloc.get_traced_memory()[1] / 1024 ** 2 if trace else None)
+    finally:
+        if trace:
+            tracemalloc.stop()
+
+
+def run_stage(name, stage, setup, data_dir, work_dir, memory=True):
+    """Cold run (no caches), warm run (caches and sidecars in place), then a traced run for memory."""
+    result = {'stage': name}
+    try:
+        fresh_copy(data_dir, work_dir, setup)
+        result['seconds'], _ = timed(stage)
+        result['warm_seconds'], _ = timed(stage)
+        if memory:
+            fresh_copy(data_dir, work_dir, setup)
+            # Peak Python allocations in this process; pool workers are not traced
+            _, result['peak_mb'] = timed(stage, trace=True)
+        result['status'] = 'ok'
+    except ImportError as e:
+        result.update(status='skipped', error=str(e))
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}")
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    previous = {stage['stage']: stage for stage in baseline['stages']} if baseline else {}
+    print(f"\n{'Stage':<22} {'Status':<8} {'Cold (s)':>9} {'Warm (s)':>9} {'Peak MB':>8} {'vs base':>8}")
+    for stage in results['stages']:
+        if stage['status'] != 'ok':
+            print(f"{stage['stage']:<22} {stage['status']:<8} {stage.get('error', '')[:60]}")
+            continue
+        peak = f"{stage['peak_mb']:.1f}" if stage.get('peak_mb') is not None else '-'
+        change = ''
+        base = previous.get(stage['stage'])
+        if base and base.get('status') == 'ok' and base['seconds'] > 0:
+            change = f"{stage['seconds'] / base['seconds']:.2f}x"
+        print(f"{stage['stage']:<22} {'ok':<8} {stage['seconds']:>9.2f} {stage['warm_seconds']:>9.2f} "
+              f"{peak:>8} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile each pipeline stage on synthetic data.")
+    parser.add_argument('--students', type=int, default=1000, help="rows per generated sheet")
+    parser.add_argument('--exams', type=int, default=6)
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--data', help="reuse an existing synthetic data folder instead of generating one")
+    parser.add_argument('--stages', nargs='*', help="only run these stages")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--compare', help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    data_dir = os.path.abspath(args.data or os.path.join(RESULTS_DIR, f"data_{args.students}"))
+    if not args.data:
+        generate(data_dir, args.students, args.exams, args.days)
+    work_dir = data_dir + '_work'
+    sys.path.insert(0, REPO_DIR)
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'students': args.students,
+        'exams': args.exams,
+        'days': args.days,
+        'stages': [],
+    }
+    for name, stage, setup in STAGES:
+        if args.stages and name not in args.stages:
+            continue
+        print(f"Running {name}...")
+        results['stages'].append(run_stage(name, stage, setup, data_dir, work_dir, memory=not args.no_memory))
+    os.chdir(REPO_DIR)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output_path = os.path.join(RESULTS_DIR, f"bench_{time.strftime('%Y%m%d_%H%M%S')}_{args.students}.json")
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# One entry per exam family. `components` maps each marks column of an
+# exported result sheet to its maximum marks; `category` is the message
+# group used by the WhatsApp senders.
+ExamFamily = namedtuple('ExamFamily', ['name', 'keywords', 'components', 'category'])
+
+# Order matters: an exam name belongs to the first family whose keyword it contains
+EXAM_FAMILIES = [
+    ExamFamily('GAT', ('GAT',), {'ENGLISH': 200, 'GAT': 400}, 'nda'),
+    ExamFamily('MATHS', ('MATHS',), {'Total Marks': 300}, 'nda'),
+    ExamFamily('JEE', ('JEE',), {'Total Marks': 360}, 'jee_neet'),
+    ExamFamily('NEET', ('NEET',), {'Total Marks': 720}, 'jee_neet'),
+    ExamFamily('CLAT', ('CLAT',), {'Total Marks': 120}, 'clat'),
+    ExamFamily('MHTCET', ('MHTCET',), {'Total Marks': 150}, 'mhtcet'),
+]
+DEFAULT_FAMILY = ExamFamily('OTHER', (), {'Total Marks': 50}, 'nda')
+
+FAMILIES_BY_NAME = {family.name: family for family in EXAM_FAMILIES}
+
+# Wide-layout columns are a prefix plus the exam number, e.g. "Total Marks12"
+WIDE_PREFIXES = ['Exam', 'Total Marks', 'GAT', 'ENGLISH', 'MATHS']
+MAX_WIDE_EXAMS = 100
+
+_FAMILY_RULES = [
+    (family, re.compile('|'.join(re.escape(keyword) for keyword in family.keywords)))
+    for family in EXAM_FAMILIES
+]
+_WIDE_COLUMN = re.compile(r'^(%s)(\d+)$' % '|'.join(re.escape(prefix) for prefix in WIDE_PREFIXES))
+
+
+@lru_cache(maxsize=None)
+def classify_exam(exam_name):
+    """Return the ExamFamily for an exam name (case-insensitive)."""
+    upper = str(exam_name).upper()
+    for family, rule in _FAMILY_RULES:
+        if rule.search(upper):
+            return family
+    return DEFAULT_FAMILY
+
+
+@lru_cache(maxsize=None)
+def parse_wide_column(column):
+    """Split a wide-layout column into (prefix, exam number), or None."""
+    match = _WIDE_COLUMN.match(str(column))
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def is_wide_column(column, prefixes=WIDE_PREFIXES, max_index=MAX_WIDE_EXAMS):
+    parsed = parse_wide_column(column)
+    return parsed is not None and parsed[0] in prefixes and 1 <= parsed[1] <= max_index
+
+
+def max_marks(exam_name):
+    """Maximum marks as the senders print them: a string, or a dict per component."""
+    components = classify_exam(exam_name).components
+    if len(components) == 1:
+        return str(next(iter(components.values())))
+    return {column: str(marks) for column, marks in components.items()}
+
+
+def columns_by_family(df, marks_prefix='Total Marks'):
+    """Group a wide sheet's marks columns by the exam family of their Exam label."""
+    families = {}
+    for column in df.columns:
+        parsed = parse_wide_column(column)
+        if parsed is None or parsed[0] != marks_prefix:
+            continue
+        labels = df[f'Exam{parsed[1]}'].dropna() if f'Exam{parsed[1]}' in df.columns else []
+        if len(labels) == 0:
+            continue
+        families.setdefault(classify_exam(labels.iloc[0]).name, []).append(column)
+    return families
@@ -0,0 +1,290 @@
+import math
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from aggregation import aggregate_by, group_codes
+from sidecar import read_frame, write_frame, write_sidecar
+
+MEMORY_BUDGET_MB = 1024
+# Rough in-memory size of a sheet relative to its file (xlsx is zipped XML)
+EXPANSION = {'.xlsx': 10, '.xls': 4, '.csv': 3}
+# Rough bytes per cell once loaded as Python objects, used to size read chunks
+CELL_BYTES = 100
+TYPICAL_COLUMNS = 50
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def estimated_memory(file_paths):
+    """Estimate in bytes of loading all files at once, from their sizes on disk."""
+    total = 0
+    for file_path in file_paths:
+        extension = os.path.splitext(file_path)[1].lower()
+        total += os.path.getsize(file_path) * EXPANSION.get(extension, 4)
+    return total
+
+
+def unique_headers(header):
+    """Header names the way read_excel makes them: blanks become 'Unnamed: i', repeats get '.1', '.2'."""
+    seen = {}
+    names = []
+    for position, name in enumerate(header):
+        name = f"Unnamed: {position}" if name is None else str(name)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iter_excel_chunks(file_path, chunk_rows):
+    """Stream an .xlsx sheet as DataFrames of at most chunk_rows rows, cell values as stored."""
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = unique_headers(header)
+        width = len(columns)
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=columns, dtype=object)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(file_path, chunk_rows):
+    """Stream any input sheet in chunks; .xls has no streaming reader and is read whole."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(file_path, chunksize=chunk_rows, dtype=object)
+    elif extension == '.xlsx':
+        yield from iter_excel_chunks(file_path, chunk_rows)
+    else:
+        df = read_frame(file_path)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows].astype(object)
+
+
+INTEGER_TEXT = r'^\s*[+-]?\d+\s*$'
+
+
+def column_stats(values, from_text):
+    """(has blanks, all numeric, all integers) for one chunk of a column.
+
+    Excel cells arrive as Python values, CSV cells as text; both are judged
+    the way read_excel / read_csv would type the column.
+    """
+    present = values.dropna()
+    has_blanks = len(present) < len(values)
+    if from_text:
+        numeric = pd.to_numeric(present, errors='coerce').notna().all()
+        integral = numeric and present.str.match(INTEGER_TEXT).all()
+    else:
+        types = present.map(type)
+        integral = types.eq(int).all()
+        numeric = integral or types.isin([int, float]).all()
+    return has_blanks, bool(numeric), bool(integral)
+
+
+def column_kind(stats):
+    """'int', 'float' or 'object': the dtype read_excel / read_csv gives a whole column."""
+    if stats is None:
+        return 'float'  # missing from the file, so NaN once concatenated
+    has_blanks, numeric, integral = stats
+    if not numeric:
+        return 'object'
+    return 'int' if integral and not has_blanks else 'float'
+
+
+def merged_kinds(file_stats, columns):
+    """Per column, the dtype pd.concat of all files would give it; unreadable files don't count."""
+    kinds = {}
+    for column in columns:
+        file_kinds = {column_kind(stats.get(column)) for stats in file_stats if stats}
+        kinds[column] = 'object' if 'object' in file_kinds else ('int' if file_kinds == {'int'} else 'float')
+    return kinds
+
+
+def restore_types(chunk, file_kinds, kinds):
+    """Cast a spilled chunk the way a full read and concat would have typed it."""
+    for column in chunk.columns:
+        kind = kinds.get(column, 'object')
+        if kind == 'object':
+            kind = file_kinds.get(column, 'object')
+            if kind == 'object':
+                continue
+            numbers = pd.to_numeric(chunk[column])
+            chunk[column] = (numbers.astype('int64') if kind == 'int' else numbers.astype('float64')).astype(object)
+        else:
+            chunk[column] = pd.to_numeric(chunk[column]).astype('int64' if kind == 'int' else 'float64')
+    return chunk
+
+
+def partition_of(names, partitions):
+    """Partition number per row, hashed from the normalised Name so spelling variants stay together."""
+    normalised = names.astype(str).str.strip().str.casefold()
+    return (pd.util.hash_pandas_object(normalised, index=False).to_numpy() % partitions).astype(np.intp)
+
+
+def combine_stats(old, new):
+    if old is None:
+        return new
+    return old[0] or new[0], old[1] and new[1], old[2] and new[2]
+
+
+def spill_partitions(file_paths, spill_dir, partitions, chunk_rows, key='Name'):
+    """Read every file in chunks and append each chunk's rows to their partition's spill file.
+
+    Spilled chunks are tagged with their file's position. Returns the union
+    of columns in first-seen order and each file's per-column type stats.
+    """
+    columns = [key]
+    file_stats = []
+    spill_files = [open(os.path.join(spill_dir, f"part{i}.pkl"), 'wb') for i in range(partitions)]
+    try:
+        for file_path in file_paths:
+            rows = 0
+            stats = {}
+            from_text = file_path.lower().endswith('.csv')
+            try:
+                for chunk in iter_chunks(file_path, chunk_rows):
+                    if key not in chunk.columns:
+                        print(f"Skipping {file_path}: no '{key}' column")
+                        break
+                    columns.extend(column for column in chunk.columns if column not in columns)
+                    for column in chunk.columns:
+                        stats[column] = combine_stats(stats.get(column), column_stats(chunk[column], from_text))
+                    chunk = chunk[chunk[key].notna()]
+                    parts = partition_of(chunk[key], partitions)
+                    for partition in np.unique(parts):
+                        pickle.dump((len(file_stats), chunk[parts == partition]), spill_files[partition],
+                                    protocol=pickle.HIGHEST_PROTOCOL)
+                    rows += len(chunk)
+                else:
+                    print(f"Added: {file_path} ({rows} rows)")
+            except Exception as e:
+                print(f"Error reading {file_path}: {str(e)}")
+            file_stats.append(stats)
+    finally:
+        for spill_file in spill_files:
+            spill_file.close()
+    return columns, file_stats
+
+
+def read_spill(spill_path, file_kinds, kinds):
+    """All chunks spilled to one partition, typed and combined (None if the partition is empty)."""
+    chunks = []
+    with open(spill_path, 'rb') as f:
+        while True:
+            try:
+                file_index, chunk = pickle.load(f)
+            except EOFError:
+                break
+            chunks.append(restore_types(chunk, file_kinds[file_index], kinds))
+    return pd.concat(chunks, ignore_index=True) if chunks else None
+
+
+def cell_value(value):
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+
+
+class StreamingExcelWriter:
+    """Append DataFrames to a write-only workbook, starting a new sheet when one is full."""
+
+    def __init__(self, output_path, columns):
+        self.output_path = output_path
+        self.columns = columns
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+        self.rows = 0
+
+    def new_sheet(self):
+        self.sheet = self.workbook.create_sheet(f"Sheet{len(self.workbook.worksheets) + 1}")
+        self.sheet.append(self.columns)
+        self.sheet_rows = 1
+
+    def append(self, df):
+        if self.sheet is None:
+            self.new_sheet()
+        for row in df[self.columns].itertuples(index=False, name=None):
+            if self.sheet_rows >= EXCEL_MAX_ROWS:
+                self.new_sheet()
+            self.sheet.append([cell_value(value) for value in row])
+            self.sheet_rows += 1
+            self.rows += 1
+
+    def close(self):
+        if self.sheet is None:
+            self.new_sheet()
+        self.workbook.save(self.output_path)
+
+
+def external_merge(file_paths, output_path, key='Name', policies=None, budget_mb=MEMORY_BUDGET_MB, partitions=None):
+    """Merge sheets on key without loading them all at once.
+
+    Rows are hash-partitioned by normalised key into spill files, each
+    partition is aggregated on its own with aggregate_by, so memory is
+    bounded by one partition rather than all inputs. Columns are typed the
+    way a full read and concat would type them, and the aggregated rows
+    (one per name, far fewer than the inputs) are sorted by key once, so
+    the output and its sidecar match the in-memory merge.
+    """
+    start = time.perf_counter()
+    budget = budget_mb * 1024 ** 2
+    if partitions is None:
+        partitions = max(1, math.ceil(estimated_memory(file_paths) / budget))
+    # A chunk of rows takes at most a quarter of the budget
+    chunk_rows = max(1000, budget // (4 * CELL_BYTES * TYPICAL_COLUMNS))
+    spill_dir = tempfile.mkdtemp(prefix='merger_spill_')
+    try:
+        print(f"Merging in {partitions} partition(s) of at most ~{budget_mb} MB each")
+        columns, file_stats = spill_partitions(file_paths, spill_dir, partitions, chunk_rows, key)
+        kinds = merged_kinds(file_stats, columns)
+        file_kinds = [{column: column_kind(column_stats) for column, column_stats in stats.items()}
+                      for stats in file_stats]
+        results = []
+        for partition in range(partitions):
+            spill_path = os.path.join(spill_dir, f"part{partition}.pkl")
+            df = read_spill(spill_path, file_kinds, kinds)
+            os.remove(spill_path)
+            if df is not None:
+                results.append(aggregate_by(df.reindex(columns=columns), key, policies))
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    if results:
+        merged = pd.concat(results, ignore_index=True)
+        # Same order as aggregate_by over all rows at once
+        codes, _ = group_codes(merged[key])
+        merged = merged.iloc[np.argsort(codes, kind='stable')].reset_index(drop=True)
+    else:
+        merged = pd.DataFrame(columns=columns)
+    if len(merged) < EXCEL_MAX_ROWS:
+        write_frame(merged, output_path)
+    else:
+        # Too many names for one sheet: spread over several, still with a sidecar
+        writer = StreamingExcelWriter(output_path, columns)
+        writer.append(merged)
+        writer.close()
+        write_sidecar(merged, output_path)
+    print(f"Merged {len(merged)} names in {time.perf_counter() - start:.1f}s")
+    return len(merged)
@@ -1,14 +1,36 @@
+import json
 import os
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from parse_cache import file_digest
+from row_dedup import drop_duplicate_rows
+from sidecar import read_frame, write_frame
+
+# Output file per category; these are never read back as inputs
+OUTPUTS = {
+    '11th': '11th_combined.xlsx',
+    '12th': '12th_combined.xlsx',
+    '11th_JEE': '11th_JEE_combined.xlsx',
+    '11th_NEET': '11th_NEET_combined.xlsx',
+    '12th_JEE': '12th_JEE_combined.xlsx',
+    '12th_NEET': '12th_NEET_combined.xlsx'
+}
+# Rows removed as duplicates, per category, e.g. '11th_combined_duplicates.xlsx'
+REPORTS = {category: output.replace('.xlsx', '_duplicates.xlsx') for category, output in OUTPUTS.items()}
+# Fingerprints of each category's inputs at its last build, kept in the folder
+MANIFEST_FILE = 'combiner_manifest.json'
+# Columns that identify a row for de-duplication; None compares whole rows.
+# Case, extra spaces and 5 vs 5.0 are ignored either way.
+DEDUP_KEYS = None
 
 def read_excel_safe(file_path):
-    """Safely read Excel files with error handling."""
+    """Safely read Excel files (or their fresh sidecar); None if the file can't be read."""
     try:
-        return pd.read_excel(file_path)
+        return read_frame(str(file_path))
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
-        return pd.DataFrame()
+        return None
 
 def categorize_files(folder_path):
     """Categorize files based on their names."""
@@ -21,8 +43,12 @@ def categorize_files(folder_path):
         '12th_NEET': []
     }
     
-    for file in Path(folder_path).glob('*.xlsx'):
+    outputs = {name.upper() for name in list(OUTPUTS.values()) + list(REPORTS.values())}
+    for file in sorted(Path(folder_path).glob('*.xlsx')):
         name = file.name.upper()
+        # Skip our own outputs and Excel's lock files
+        if name in outputs or name.startswith('~$'):
+            continue
         if '11TH' in name and 'JEE' in name:
             categories['11th_JEE'].append(file)
         elif '11TH' in name and 'NEET' in name:
@@ -38,44 +64,119 @@ def categorize_files(folder_path):
     
     return categories
 
-def combine_files(file_list):
-    """Combine multiple Excel files into one DataFrame."""
+def read_files(file_list, max_workers=None):
+    """Read files in parallel; returns {file: DataFrame}, None for files that failed."""
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {f: executor.submit(read_excel_safe, f) for f in file_list}
+        return {f: future.result() for f, future in futures.items()}
+
+def combine_files(file_list, frames=None, key_columns=DEDUP_KEYS):
+    """Combine multiple Excel files into one DataFrame without duplicate rows.
+
+    frames optionally holds files already read by read_files. Returns
+    (combined, removed), removed listing each dropped row and its source.
+    Files that could not be read are left out.
+    """
     if not file_list:
-        return pd.DataFrame()
+        return pd.DataFrame(), pd.DataFrame()
     
-    dfs = [read_excel_safe(f) for f in file_list]
-    combined_df = pd.concat(dfs, ignore_index=True)
-    return combined_df.drop_duplicates()
+    if frames is None:
+        frames = read_files(file_list)
+    return drop_duplicate_rows([(Path(f).name, frames[f]) for f in file_list if frames[f] is not None],
+                               key_columns)
+
+def fingerprint(file_path, previous=None):
+    """[size, mtime_ns, content digest]; the digest is reused while size and mtime match."""
+    stat = os.stat(file_path)
+    if previous and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+        return previous
+    return [stat.st_size, stat.st_mtime_ns, file_digest(file_path)]
 
-def process_folder(folder_path= "aligner"):
-    """Main function to process the folder."""
+def load_manifest(folder_path):
+    try:
+        with open(os.path.join(folder_path, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(folder_path, manifest):
+    manifest_path = os.path.join(folder_path, MANIFEST_FILE)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+def output_stamp(output_path):
+    if not os.path.exists(output_path):
+        return None
+    stat = os.stat(output_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def process_folder(folder_path= "aligner", max_workers=None, force=False):
+    """Main function to process the folder.
+
+    Only categories whose inputs changed since the last run (or whose output
+    was removed or edited) are rebuilt; their files are read in parallel.
+    """
     try:
         # Get categorized file lists
         categories = categorize_files(folder_path)
+        manifest = load_manifest(folder_path)
+        new_manifest = {}
+        
+        # Find the categories that need rebuilding
+        stale = {}
+        for category, files in categories.items():
+            if not files:
+                continue
+            previous = manifest.get(category, {})
+            known = previous.get('inputs', {})
+            inputs = {f.name: fingerprint(f, known.get(f.name)) for f in files}
+            output_path = os.path.join(folder_path, OUTPUTS[category])
+            # Compare contents, so a file that was only re-saved or touched doesn't count
+            same_inputs = ({name: fp[2] for name, fp in inputs.items()} ==
+                           {name: fp[2] for name, fp in known.items()})
+            if (not force and same_inputs and previous.get('output') is not None
+                    and previous.get('output') == output_stamp(output_path)):
+                print(f"{category}: inputs unchanged, keeping {OUTPUTS[category]}")
+                new_manifest[category] = dict(previous, inputs=inputs)
+            else:
+                stale[category] = (files, inputs)
         
-        # Define output mapping
-        outputs = {
-            '11th': '11th_combined.xlsx',
-            '12th': '12th_combined.xlsx',
-            '11th_JEE': '11th_JEE_combined.xlsx',
-            '11th_NEET': '11th_NEET_combined.xlsx',
-            '12th_JEE': '12th_JEE_combined.xlsx',
-            '12th_NEET': '12th_NEET_combined.xlsx'
-        }
+        # Read every stale category's files in one pool
+        frames = {}
+        if stale:
+            frames = read_files([f for files, _ in stale.values() for f in files], max_workers)
         
         # Process each category
-        for category, files in categories.items():
-            if files:
-                print(f"Processing {category} files...")
-                combined_df = combine_files(files)
-                if not combined_df.empty:
-                    output_path = os.path.join(folder_path, outputs[category])
-                    combined_df.to_excel(output_path, index=False)
-                    print(f"Created {outputs[category]}")
+        for category, (files, inputs) in stale.items():
+            print(f"Processing {category} files...")
+            combined_df, removed = combine_files(files, frames)
+            output_path = os.path.join(folder_path, OUTPUTS[category])
+            if not combined_df.empty:
+                write_frame(combined_df, output_path)
+                print(f"Created {OUTPUTS[category]}")
+            report_path = os.path.join(folder_path, REPORTS[category])
+            if len(removed):
+                removed.to_excel(report_path, index=False)
+                for source, count in removed['Source'].value_counts(sort=False).items():
+                    print(f"  Removed {count} duplicate rows from {source}")
+                print(f"  Duplicates listed in {REPORTS[category]}")
+            elif os.path.exists(report_path):
+                os.remove(report_path)
+            # Files that failed to read aren't recorded, so the category is rebuilt next run
+            failed = [f.name for f in files if frames[f] is None]
+            if failed:
+                print(f"  Not combined (read errors): {', '.join(failed)}")
+            inputs = {name: fp for name, fp in inputs.items() if name not in failed}
+            new_manifest[category] = {'inputs': inputs, 'output': output_stamp(output_path)}
+        
+        save_manifest(folder_path, new_manifest)
                 
     except Exception as e:
         print(f"Error processing folder: {e}")
 
 if __name__ == "__main__":
+    import sys
     folder_path = "./aligner"
-    process_folder(folder_path)
\ No newline at end of file
+    # --force rebuilds every category even if its inputs are unchanged
+    process_folder(folder_path, force='--force' in sys.argv[1:])
\ No newline at end of file
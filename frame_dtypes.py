@@ -0,0 +1,111 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from exam_schema import parse_wide_column
+
+try:
+    import pyarrow  # noqa: F401
+    NAME_DTYPE = 'string[pyarrow]'
+except ImportError:
+    NAME_DTYPE = 'string'
+
+NAME_COLUMNS = {'Name', 'NAME'}
+PHONE_COLUMNS = {
+    'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.',
+    'MOTHER NO', 'FATHER NO', 'SELF NO',
+}
+MARKS_PREFIXES = {'Total Marks', 'GAT', 'ENGLISH', 'MATHS'}
+SUBJECTIVE_MARKS = re.compile(r'^Subjective Marks\d*$')
+
+
+def column_kind(column):
+    """Classify a column as 'name', 'phone', 'exam', 'marks' or None."""
+    if column in NAME_COLUMNS:
+        return 'name'
+    if column in PHONE_COLUMNS:
+        return 'phone'
+    if column == 'Exam':
+        return 'exam'
+    if column in MARKS_PREFIXES or SUBJECTIVE_MARKS.match(str(column)):
+        return 'marks'
+    parsed = parse_wide_column(column)
+    if parsed is not None:
+        return 'exam' if parsed[0] == 'Exam' else 'marks'
+    return None
+
+
+def compact_marks(series):
+    """Marks as float32 (float64 if float32 would change a value), or None.
+
+    A column holding any text, such as an absent token ("AB", "-") or
+    "45/100", is left as it is (None) so the text reaches the output as
+    written. float32 is used only when it round-trips exactly, so values
+    like 45.3 written back to Excel stay 45.3.
+    """
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        text = series.astype('string').str.strip()
+        numeric = pd.to_numeric(text, errors='coerce')
+        if (numeric.isna() & text.notna() & (text != '')).any():
+            return None
+    elif pd.api.types.is_numeric_dtype(series):
+        numeric = series
+    else:
+        return None
+
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    as_float32 = values.astype(np.float32)
+    lossless = np.array_equal(as_float32.astype(np.float64), values, equal_nan=True)
+    return pd.Series(as_float32 if lossless else values, index=series.index, name=series.name)
+
+
+def compact_phone(series):
+    """Integral phone numbers become nullable Int64; anything else is left as is."""
+    if pd.api.types.is_integer_dtype(series):
+        return series.astype('Int64')
+    numeric = pd.to_numeric(series, errors='coerce')
+    if (numeric.isna() & series.notna()).any():
+        return None
+    if not np.all(np.mod(numeric.dropna().to_numpy(dtype=np.float64), 1) == 0):
+        return None
+    return numeric.astype('Int64')
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compact_frame(df, report=True, label=None):
+    """Normalise a marks/roster frame to compact dtypes.
+
+    Names become strings, exam labels categorical, integral phone numbers
+    Int64 and purely numeric marks float32 (float64 if float32 would change
+    a value). Marks columns with absent tokens or other text are kept as
+    written.
+    """
+    if not df.columns.is_unique:
+        return df
+    before = memory_mb(df) if report else 0.0
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        kind = column_kind(column)
+        if kind == 'name':
+            columns[column] = series.astype(NAME_DTYPE)
+        elif kind == 'exam':
+            columns[column] = series.astype('category')
+        elif kind == 'phone':
+            phone = compact_phone(series)
+            columns[column] = series if phone is None else phone
+        elif kind == 'marks':
+            marks = compact_marks(series)
+            columns[column] = series if marks is None else marks
+        else:
+            columns[column] = series
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    if report:
+        prefix = f"Memory ({label})" if label else "Memory"
+        print(f"{prefix}: {before:.2f} MB -> {memory_mb(compacted):.2f} MB")
+    return compacted
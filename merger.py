@@ -1,5 +1,12 @@
 import os
 import pandas as pd
+from aggregation import aggregate_by
+from external_merge import MEMORY_BUDGET_MB, estimated_memory, external_merge
+from sidecar import read_frame, write_frame
+
+# Per-column conflict policies for rows that share a Name ('join', 'first', 'last' or 'max').
+# Columns not listed join their distinct values, e.g. {'Roll No': 'first', 'Total Marks': 'max'}
+COLUMN_POLICIES = {}
 
 def clean_file_path(file_path):
     # Remove leading '&' and space if present (PowerShell drag and drop artifact)
@@ -24,11 +31,21 @@ def get_file_path(prompt):
             print(f"File not found: {file_path}")
             print("Please try again or press Ctrl+C to exit.")
 
-def merge_excel_files(file_paths, output_folder):
+def merge_excel_files(file_paths, output_folder, policies=None, budget_mb=MEMORY_BUDGET_MB):
+    if policies is None:
+        policies = COLUMN_POLICIES
+    # Inputs too big to hold at once are merged partition by partition from disk
+    if estimated_memory(file_paths) > budget_mb * 1024 ** 2:
+        os.makedirs(output_folder, exist_ok=True)
+        output_path = os.path.join(output_folder, "merged_file.xlsx")
+        external_merge(file_paths, output_path, 'Name', policies, budget_mb)
+        print(f"Merged file saved as: {output_path}")
+        return
+
     all_dfs = []
     for file_path in file_paths:
         try:
-            df = pd.read_excel(file_path)
+            df = read_frame(file_path)
             all_dfs.append(df)
             print(f"Added: {file_path}")
         except Exception as e:
@@ -41,8 +58,8 @@ def merge_excel_files(file_paths, output_folder):
     # Merge all DataFrames
     merged_df = pd.concat(all_dfs, ignore_index=True)
     
-    # Group by 'Name' and merge other columns
-    merged_df = merged_df.groupby('Name', as_index=False).agg(lambda x: ', '.join(map(str, x.dropna().unique())))
+    # One row per Name; other columns are combined by their policy
+    merged_df = aggregate_by(merged_df, 'Name', policies)
 
     # Ensure output folder exists
     if not os.path.exists(output_folder):
@@ -50,7 +67,7 @@ def merge_excel_files(file_paths, output_folder):
     
     # Save the merged DataFrame to Excel
     output_path = os.path.join(output_folder, "merged_file.xlsx")
-    merged_df.to_excel(output_path, index=False)
+    write_frame(merged_df, output_path)
     print(f"Merged file saved as: {output_path}")
 
 def main():
@@ -0,0 +1,125 @@
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+REPORT_COLUMNS = ['Name', 'Matched Name', 'Method', 'Score']
+# Only these are joined; fuzzy candidates are reported as 'suggested' for a person to check,
+# since a near-miss like 'Diya Patil' / 'Riya Patil' is usually a different student
+JOIN_METHODS = ('exact', 'reordered')
+
+
+def normalize_name(name):
+    return re.sub(r'\s+', '', str(name)).lower()
+
+
+def token_key(name):
+    """Whitespace/case-insensitive key that also ignores word order."""
+    return ''.join(sorted(str(name).lower().split()))
+
+
+def ngrams(key, n):
+    if len(key) <= n:
+        return {key}
+    return {key[i:i + n] for i in range(len(key) - n + 1)}
+
+
+class NameIndex:
+    """Index of reference names for exact, reordered and fuzzy lookups.
+
+    Exact matches use the normalised key (no whitespace, lower case). Names
+    that miss are retried with word order ignored, then fuzzily: candidates
+    are blocked by shared character n-grams and only the best few in the
+    block are scored with SequenceMatcher. Fuzzy results are only
+    suggestions ('suggested'); merge_on_names does not join them.
+    """
+
+    def __init__(self, names, ngram=3, min_score=0.85, max_candidates=5, max_block=200):
+        self.names = [name for name in names if pd.notna(name)]
+        self.ngram = ngram
+        self.min_score = min_score
+        self.max_candidates = max_candidates
+        self.max_block = max_block
+
+        # Later names win, the same as drop_duplicates(keep='last')
+        self.exact = {normalize_name(name): name for name in self.names}
+        self.reordered = {token_key(name): name for name in self.names}
+        self.keys = list(self.exact)
+        self.blocks = defaultdict(list)
+        for key_id, key in enumerate(self.keys):
+            for gram in ngrams(key, ngram):
+                self.blocks[gram].append(key_id)
+
+    def lookup(self, name):
+        """Return (matched name, method, score) for one query name."""
+        if pd.isna(name):
+            return None, 'none', 0.0
+        key = normalize_name(name)
+        if key in self.exact:
+            return self.exact[key], 'exact', 1.0
+        reordered = self.reordered.get(token_key(name))
+        if reordered is not None:
+            return reordered, 'reordered', 1.0
+
+        # Count shared n-grams per candidate, skipping grams too common to discriminate
+        grams = ngrams(key, self.ngram)
+        shared = Counter()
+        for gram in grams:
+            block = self.blocks.get(gram)
+            if block and len(block) <= self.max_block:
+                shared.update(block)
+        best_name, best_score = None, 0.0
+        for key_id, _ in shared.most_common(self.max_candidates):
+            candidate = self.keys[key_id]
+            matcher = SequenceMatcher(None, key, candidate)
+            if matcher.quick_ratio() < self.min_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best_name, best_score = self.exact[candidate], score
+        if best_score >= self.min_score:
+            return best_name, 'suggested', round(best_score, 3)
+        return None, 'none', round(best_score, 3)
+
+    def match(self, names):
+        """Match a sequence of names and return the confidence report."""
+        rows = [(name,) + self.lookup(name) for name in names]
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def merge_on_names(left_df, right_df, on='Name', **index_options):
+    """Left-join right_df onto left_df through a NameIndex instead of raw strings.
+
+    Only exact and reordered matches are joined; rows with a fuzzy
+    suggestion keep empty right-hand columns. Returns the merged frame
+    (left rows and order preserved) and the match report for every left
+    row, suggestions included.
+    """
+    start = time.perf_counter()
+    index = NameIndex(right_df[on], **index_options)
+    report = index.match(left_df[on])
+    joined = report['Method'].isin(JOIN_METHODS).to_numpy()
+    matched = left_df.assign(_matched_name=report['Matched Name'].where(joined).to_numpy())
+    # Unmatched rows carry a missing key; drop missing right names so they can't pair up
+    right_df = right_df[right_df[on].notna()]
+    merged_df = matched.merge(
+        right_df.rename(columns={on: '_matched_name'}), on='_matched_name', how='left'
+    ).drop(columns='_matched_name')
+
+    counts = report['Method'].value_counts()
+    print(f"Matched {len(report)} names in {time.perf_counter() - start:.2f}s: "
+          f"{counts.get('exact', 0)} exact, {counts.get('reordered', 0)} reordered, "
+          f"{counts.get('none', 0)} unmatched, {counts.get('suggested', 0)} with a suggested match "
+          f"(not joined, see the name match report)")
+    return merged_df, report
+
+
+def write_match_report(report, output_path):
+    """Save the name-match report next to an output file."""
+    report_path = os.path.splitext(output_path)[0] + '_name_matches.csv'
+    report.to_csv(report_path, index=False)
+    print(f"Name match report saved to {report_path}")
+    return report_path
@@ -1,121 +1,202 @@
 import pandas as pd
 import os
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from attendance_analytics import date_from_filename
+from exam_schema import classify_exam
+from frame_dtypes import compact_frame
+from name_matcher import merge_on_names, write_match_report
+from sidecar import read_frame, write_frame
 
 
-def load_data(file_path):
+def load_data(file_path, usecols=None):
     ext = os.path.splitext(file_path)[1].lower()
     if ext in ['.xls', '.xlsx']:
         try:
-            return pd.read_excel(file_path)
+            df = read_frame(file_path, usecols=usecols)
         except Exception as e:
             raise ValueError(f"Error loading {file_path}: {e}")
     elif ext == '.csv':
-        return pd.read_csv(file_path)
+        df = read_frame(file_path, usecols=usecols)
     else:
         raise ValueError(f"Unsupported file format: {file_path}")
+    # Marks columns with absent tokens (AB, A, -) are kept as written so they reach the output
+    df = compact_frame(df, label=os.path.basename(file_path))
+    return df
 
 
-def filter_columns(df, is_gat_exam=False):
-    if is_gat_exam:
-        allowed_columns = {'Name', 'Exam', 'ENGLISH', 'GAT'}
-    else:
-        allowed_columns = {'Name', 'Exam', 'Total Marks'}
+def filter_columns(df, family):
+    allowed_columns = {'Name', 'Exam'} | set(family.components)
     return df[[col for col in df.columns if col in allowed_columns]]
 
 
-def gather_contacts(contact_folder):
-    contacts_df = pd.DataFrame()
+CONTACT_COLUMNS = ['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
+
+
+def load_contact_file(file_path):
+    """Read only the contact columns from one file and time the load."""
+    start = time.perf_counter()
+    df = load_data(file_path, usecols=CONTACT_COLUMNS)
+    return df, time.perf_counter() - start
+
+
+def gather_contacts(contact_folder, max_workers=None):
+    file_names = []
     for filename in os.listdir(contact_folder):
         file_path = os.path.join(contact_folder, filename)
         if os.path.isdir(file_path) or filename.startswith('~') or filename.startswith('.'):
             continue
-        try:
-            df = load_data(file_path)
-            required_columns = ['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
-            if all(column in df.columns for column in required_columns):
-                contacts_df = pd.concat([contacts_df, df[required_columns]], ignore_index=True)
-            else:
-                print(f"File '{filename}' does not contain the required columns and will be skipped.")
-        except Exception as e:
-            print(f"Error processing file '{filename}': {e}")
+        file_names.append(filename)
+
+    # Parse the workbooks in parallel, then concatenate once in folder order
+    frames = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(filename, executor.submit(load_contact_file, os.path.join(contact_folder, filename)))
+                   for filename in file_names]
+        for filename, future in futures:
+            try:
+                current_df, load_time = future.result()
+                if all(column in current_df.columns for column in CONTACT_COLUMNS):
+                    frames.append(current_df[CONTACT_COLUMNS])
+                    print(f"Loaded contacts from '{filename}' in {load_time:.2f}s")
+                else:
+                    print(f"File '{filename}' does not contain the required columns and will be skipped.")
+            except Exception as e:
+                print(f"Error processing file '{filename}': {e}")
 
+    if frames:
+        contacts_df = pd.concat(frames, ignore_index=True)
+    else:
+        contacts_df = pd.DataFrame(columns=CONTACT_COLUMNS)
     contacts_df.drop_duplicates(subset=['Name'], keep='last', inplace=True)
     return contacts_df
 
 
-def merge_exam_data(merged_df, exam_file, exam_index, is_gat_exam=False):
+GRADES = ['11TH', '12TH']
+EXAM_TYPES = [['GAT', 'MATHS', 'MHTCET'], ['JEE'], ['NEET']]
+
+# Compiled once: a file belongs to the first grade / exam family whose rule matches
+GRADE_RULES = [(grade, re.compile(re.escape(grade))) for grade in GRADES]
+FAMILY_RULES = [(keyword, re.compile(re.escape(keyword)))
+                for keywords in EXAM_TYPES for keyword in keywords]
+
+EvalbeeFile = namedtuple('EvalbeeFile', ['path', 'name', 'grade', 'family', 'date'])
+
+
+def classify_evalbee_file(file_name):
+    """Return (grade, exam family) for an Evalbee export name, or None for either."""
+    upper = file_name.upper()
+    grade = next((grade for grade, rule in GRADE_RULES if rule.search(upper)), None)
+    family = next((keyword for keyword, rule in FAMILY_RULES if rule.search(upper)), None)
+    return grade, family
+
+
+def catalog_evalbee(folder):
+    """Scan the Evalbee folder once and classify every exam file in it."""
+    catalog = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name.startswith('~') or entry.name.startswith('.'):
+                continue
+            grade, family = classify_evalbee_file(entry.name)
+            if grade is None or family is None:
+                continue
+            catalog.append(EvalbeeFile(entry.path, entry.name, grade, family, date_from_filename(entry.name)))
+    return catalog
+
+
+def group_catalog(catalog, grade, keywords):
+    """Files for one (grade, exam-type) group in keyword, date, then name order."""
+    files = [entry for entry in catalog if entry.grade == grade and entry.family in keywords]
+    return sorted(files, key=lambda entry: (
+        keywords.index(entry.family),
+        entry.date is None,
+        entry.date if entry.date is not None else pd.Timestamp.min,
+        entry.name
+    ))
+
+
+# Parsed exam files kept between watch-mode refreshes, keyed by path
+_exam_frames = {}
+
+
+def load_exam_file(exam_file):
+    """load_data with an in-process cache that is invalidated by mtime/size."""
+    stat = os.stat(exam_file)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _exam_frames.get(exam_file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
     exam_df = load_data(exam_file)
+    _exam_frames[exam_file] = (key, exam_df)
+    return exam_df
+
+
+def prepare_exam_frame(exam_file, exam_index, family):
+    """Load one exam file, renamed for its exam index and indexed by Name."""
+    exam_df = load_exam_file(exam_file)
     if 'Name' not in exam_df.columns:
         raise ValueError(f"Missing 'Name' column in {exam_file}")
 
-    # Filter and rename columns for merging
-    exam_df = filter_columns(exam_df, is_gat_exam)
-    
-    if is_gat_exam:
-        new_columns = {
-            'Exam': f'Exam{exam_index}',
-            'ENGLISH': f'ENGLISH{exam_index}',
-            'GAT': f'GAT{exam_index}'
-        }
-    else:
-        new_columns = {
-            'Exam': f'Exam{exam_index}',
-            'Total Marks': f'Total Marks{exam_index}'
-        }
+    # Filter and rename columns for merging (GAT exams carry ENGLISH and GAT marks)
+    exam_df = filter_columns(exam_df, family)
+    new_columns = {column: f'{column}{exam_index}' for column in ['Exam'] + list(family.components)}
     
     exam_df = exam_df.rename(columns=new_columns)
+    exam_df = exam_df[['Name'] + list(new_columns.values())].dropna(subset=['Name'])
+    return exam_df.drop_duplicates(subset=['Name'], keep='last').set_index('Name')
 
-    # Merge data and remove duplicate names
-    merged_df = pd.merge(merged_df, exam_df[['Name'] + list(new_columns.values())], on='Name', how='outer')
-    merged_df.drop_duplicates(subset=['Name'], keep='last', inplace=True)
-    return merged_df
 
+def merge_group(files, grade, keywords, output_folder):
+    """Align every exam of one (grade, exam-type) group in a single outer concat.
 
-def merge_by_keyword(folder, grade, keywords, output_folder):
-    merged_df = pd.DataFrame(columns=['Name'])
-    exam_index = 1
+    Returns (output_file, merged_df), or (None, None) when the group is empty.
+    """
+    exam_frames = []
+    for entry in files:
+        print(f"Processing {entry.path}...")
+        try:
+            family = classify_exam(entry.family)
+            exam_frames.append(prepare_exam_frame(entry.path, len(exam_frames) + 1, family))
+        except Exception as e:
+            print(f"Error processing file {entry.path}: {e}")
 
-    grade_files = [file for file in os.listdir(folder) if grade in file.upper()]
-    for keyword in keywords:
-        keyword_files = [os.path.join(folder, file) for file in grade_files if keyword in file.upper()]
-        for file_path in keyword_files:
-            print(f"Processing {file_path}...")
-            try:
-                # Check if current file is a GAT exam
-                is_gat_exam = 'GAT' in keyword.upper()
-                merged_df = merge_exam_data(merged_df, file_path, exam_index, is_gat_exam)
-                exam_index += 1
-            except Exception as e:
-                print(f"Error processing file {file_path}: {e}")
+    merged_df = pd.DataFrame(columns=['Name'])
+    if exam_frames:
+        merged_df = pd.concat(exam_frames, axis=1, join='outer', sort=True)
+        merged_df = merged_df.rename_axis('Name').reset_index()
 
     if not merged_df.empty:
         output_file = os.path.join(output_folder, f"{grade}_{'_'.join(keywords).upper()}_merged.xlsx")
-        merged_df.to_excel(output_file, index=False)
+        write_frame(merged_df, output_file)
         print(f"Merged data for {grade} {' and '.join(keywords)} saved to {output_file}")
-        return output_file
+        return output_file, merged_df
     else:
         print(f"No data found for {grade} {' and '.join(keywords)} in the folder.")
-        return None
+        return None, None
 
 
-def append_all_files(files_to_append, output_folder, contact_folder):
-    appended_df = pd.DataFrame()
-    for file in files_to_append:
-        try:
-            df = pd.read_excel(file)
-            appended_df = pd.concat([appended_df, df], ignore_index=True)
-        except Exception as e:
-            print(f"Error appending file {file}: {e}")
+def merge_group_task(task):
+    """Process-pool entry point for one (grade, exam-type) group."""
+    return merge_group(*task)
+
+
+def append_all_files(frames_to_append, output_folder, contact_folder):
+    """Append the merged group frames (already in memory) into one workbook."""
+    if frames_to_append:
+        appended_df = pd.concat(frames_to_append, ignore_index=True)
+    else:
+        appended_df = pd.DataFrame(columns=['Name'])
 
     # Merge with contact details
     try:
         contacts_df = gather_contacts(contact_folder)
-        appended_df = pd.merge(
-            appended_df,
-            contacts_df,
-            on='Name',
-            how='left'
-        )
+        appended_df, match_report = merge_on_names(appended_df, contacts_df)
+        write_match_report(match_report, os.path.join(output_folder, "all_merged_data.xlsx"))
         print("Contacts successfully merged into appended data.")
     except Exception as e:
         print(f"Error merging contacts: {e}")
@@ -125,29 +206,133 @@ def append_all_files(files_to_append, output_folder, contact_folder):
 
     if not appended_df.empty:
         output_file = os.path.join(output_folder, "all_merged_data.xlsx")
-        appended_df.to_excel(output_file, index=False)
+        write_frame(appended_df, output_file)
         print(f"Appended data saved to {output_file}")
     else:
         print("No data to append.")
 
 
-def auto_merge_evalbee(folder, contact_folder, output_folder):
+def auto_merge_evalbee(folder, contact_folder, output_folder, max_workers=None):
     os.makedirs(output_folder, exist_ok=True)
 
-    all_files = []
-    grades = ['11TH', '12TH']
-    exam_types = [['GAT', 'MATHS', 'MHTCET'], ['JEE'], ['NEET']]
+    catalog = catalog_evalbee(folder)
+    print(f"Catalogued {len(catalog)} Evalbee exam file(s).")
 
-    for grade in grades:
-        for keywords in exam_types:
-            merged_file = merge_by_keyword(folder, grade, keywords, output_folder)
-            if merged_file:
-                all_files.append(merged_file)
+    # The groups are independent, so each one is read, merged and written in its own process
+    tasks = [(group_catalog(catalog, grade, keywords), grade, keywords, output_folder)
+             for grade in GRADES for keywords in EXAM_TYPES]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(merge_group_task, tasks))
+    print(f"Merged {len(tasks)} groups in {time.perf_counter() - start:.2f}s")
+    all_frames = [merged_df for merged_file, merged_df in results if merged_file]
 
     # Append all files if user agrees
     append_choice = input("Do you want to append all merged files into one? (yes/no): ").strip().lower()
     if append_choice == "yes":
-        append_all_files(all_files, output_folder, contact_folder)
+        append_all_files(all_frames, output_folder, contact_folder)
+
+
+def snapshot_folder(folder):
+    """Map each file name in the folder to its (mtime, size) fingerprint."""
+    with os.scandir(folder) as entries:
+        return {entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in entries if entry.is_file()}
+
+
+def start_observer(folder, wake):
+    """Set `wake` on filesystem events (inotify on Linux) if watchdog is installed."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        print("watchdog is not installed; polling the folder for changes instead.")
+        return None
+
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    observer.schedule(WakeHandler(), folder, recursive=False)
+    observer.start()
+    return observer
+
+
+def watch_evalbee(folder, contact_folder, output_folder, poll_interval=2.0, settle_time=1.0):
+    """Keep the merged workbooks fresh as new Evalbee exports land.
+
+    Only the (grade, exam-type) groups whose files changed are re-merged,
+    re-using the parsed frames of unchanged files, and all_merged_data.xlsx
+    is refreshed after every change. Stop with Ctrl+C.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+
+    # Merged in-process so the parsed-frame cache stays warm for later refreshes
+    group_frames = {}
+    catalog = catalog_evalbee(folder)
+    for grade in GRADES:
+        for keywords in EXAM_TYPES:
+            merged_file, merged_df = merge_group(group_catalog(catalog, grade, keywords), grade, keywords, output_folder)
+            if merged_file:
+                group_frames[(grade, tuple(keywords))] = merged_df
+    append_all_files(list(group_frames.values()), output_folder, contact_folder)
+
+    wake = threading.Event()
+    observer = start_observer(folder, wake)
+    # With an observer the timeout is only a safety net against missed events
+    wait_timeout = poll_interval * 15 if observer else poll_interval
+    snapshot = snapshot_folder(folder)
+    print(f"Watching '{folder}' for new or changed exports. Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            wake.wait(timeout=wait_timeout)
+            wake.clear()
+            current = snapshot_folder(folder)
+            if current == snapshot:
+                continue
+
+            # Wait until the export has finished writing
+            while True:
+                time.sleep(settle_time)
+                settled = snapshot_folder(folder)
+                if settled == current:
+                    break
+                current = settled
+
+            start = time.perf_counter()
+            changed = {name for name in set(snapshot) | set(current) if snapshot.get(name) != current.get(name)}
+            snapshot = current
+            for name in changed:
+                _exam_frames.pop(os.path.join(folder, name), None)
+
+            affected = set()
+            for name in changed:
+                grade, family = classify_evalbee_file(name)
+                if grade is None or family is None:
+                    continue
+                keywords = next(keywords for keywords in EXAM_TYPES if family in keywords)
+                affected.add((grade, tuple(keywords)))
+            if not affected:
+                continue
+
+            print(f"\nChange detected in: {', '.join(sorted(changed))}")
+            catalog = catalog_evalbee(folder)
+            for grade, keywords in sorted(affected):
+                merged_file, merged_df = merge_group(group_catalog(catalog, grade, list(keywords)), grade, list(keywords), output_folder)
+                if merged_file:
+                    group_frames[(grade, keywords)] = merged_df
+                else:
+                    group_frames.pop((grade, keywords), None)
+            append_all_files(list(group_frames.values()), output_folder, contact_folder)
+            print(f"Refreshed {len(affected)} group(s) in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        if observer:
+            observer.stop()
+            observer.join()
 
 
 def main():
@@ -155,11 +340,26 @@ def main():
     contact_folder = 'Data'
     output_folder = 'Output'
 
+    # Optional "--workers N" limits the number of group-merging processes
+    args = sys.argv[1:]
+    max_workers = None
+    if '--workers' in args:
+        try:
+            max_workers = int(args[args.index('--workers') + 1])
+            if max_workers < 1:
+                raise ValueError(max_workers)
+        except (IndexError, ValueError):
+            print("Error: --workers needs a positive whole number, e.g. --workers 4")
+            return
+
     try:
-        auto_merge_evalbee(evalbee_folder, contact_folder, output_folder)
+        if '--watch' in args:
+            watch_evalbee(evalbee_folder, contact_folder, output_folder)
+        else:
+            auto_merge_evalbee(evalbee_folder, contact_folder, output_folder, max_workers)
     except Exception as e:
         print(f"Error: {e}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -9,6 +9,8 @@ from tkinterdnd2 import TkinterDnD, DND_FILES
 from tkinter import messagebox
 import os
 import threading
+from exam_schema import classify_exam, max_marks
+from sidecar import read_frame
 
 # Speed optimization: Set pyautogui to be faster
 pyautogui.PAUSE = 0.1  # Reduce default pause between actions
@@ -55,20 +57,7 @@ def send_whatsapp_message_via_url(phone_number, message, name, recipient):
 
 def get_exam_total_marks(exam_name):
     """Determine total marks based on exam type."""
-    exam_upper = exam_name.upper()
-    if "MATHS" in exam_upper:
-        return "300"
-    elif "GAT" in exam_upper:
-        return {"ENGLISH": "200", "GAT": "400"}  # Modified for GAT exam
-    elif "JEE" in exam_upper:
-        return "360"
-    elif "NEET" in exam_upper:
-        return "720"
-    elif "CLAT" in exam_upper:
-        return "120"
-    elif "MHTCET" in exam_upper:
-        return "150"
-    return "50"  # Default case
+    return max_marks(exam_name)
 
 def create_exam_message(name, exams, recipient_type, exam_category):
     """Generic message creator for all exam types."""
@@ -87,13 +76,15 @@ def create_exam_message(name, exams, recipient_type, exam_category):
         message = f"{greeting}Dear Parent,\n\n🧾 The Academic progress detail of your ward {name} for the following {category_texts[exam_category]} is as below: 🧾\n\n"
 
     for exam_name, marks_data in exams.items():
-        if isinstance(marks_data, dict) and 'ENGLISH' in marks_data:  # For GAT exam with ENGLISH and GAT components
+        if isinstance(marks_data, dict):  # For multi-component exams, e.g. GAT with ENGLISH and GAT
+            component_totals = get_exam_total_marks(exam_name)
             message += f"📊 {exam_name} Test details -\n"
-            if marks_data.get('ENGLISH') == "Absent" and marks_data.get('GAT') == "Absent":
+            if all(marks == "Absent" for marks in marks_data.values()):
                 message += "Total Marks - Absent\n\n"
             else:
-                message += f"ENGLISH Marks - {marks_data['ENGLISH']}/200\n"
-                message += f"GAT Marks - {marks_data['GAT']}/400\n\n"
+                for component, marks in marks_data.items():
+                    message += f"{component} Marks - {marks}/{component_totals[component]}\n"
+                message += "\n"
         else:  # For other exams including MATHS
             total_marks = get_exam_total_marks(exam_name)
             if marks_data == "Absent":
@@ -142,49 +133,25 @@ def process_data(df):
             exam_name = row.get(f'Exam{i}')
             
             if pd.notna(exam_name) and str(exam_name).strip():
-                exam_upper = str(exam_name).upper()
+                family = classify_exam(exam_name)
                 
-                if "GAT" in exam_upper:
-                    # Handle GAT exam with ENGLISH and GAT components
-                    english_marks = row.get(f'ENGLISH{i}', None)
-                    gat_marks = row.get(f'GAT{i}', None)
+                if len(family.components) > 1:
+                    # Handle multi-component exams (GAT with ENGLISH and GAT components)
+                    component_marks = {component: row.get(f'{component}{i}', None) for component in family.components}
                     
                     # Debug logging
-                    logging.info(f"Processing GAT exam for {name}:")
-                    logging.info(f"English marks: {english_marks}, GAT marks: {gat_marks}")
+                    logging.info(f"Processing {family.name} exam for {name}:")
+                    logging.info(", ".join(f"{component} marks: {marks}" for component, marks in component_marks.items()))
                     
                     # Only mark as Absent if the marks are explicitly NaN or None
-                    english_val = "Absent" if pd.isna(english_marks) else remove_trailing_zeros(english_marks)
-                    gat_val = "Absent" if pd.isna(gat_marks) else remove_trailing_zeros(gat_marks)
-                    
-                    exam_categories["nda"][exam_name] = {
-                        "ENGLISH": english_val,
-                        "GAT": gat_val
+                    exam_categories[family.category][exam_name] = {
+                        component: "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
+                        for component, marks in component_marks.items()
                     }
-                elif "MATHS" in exam_upper:
-                    marks = row.get(f'Total Marks{i}', None)
-                    marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["nda"][exam_name] = marks_val
-                elif "JEE" in exam_upper:
-                    marks = row.get(f'Total Marks{i}', None)
-                    marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["jee_neet"][exam_name] = marks_val
-                elif "NEET" in exam_upper:
-                    marks = row.get(f'Total Marks{i}', None)
-                    marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["jee_neet"][exam_name] = marks_val
-                elif "CLAT" in exam_upper:
-                    marks = row.get(f'Total Marks{i}', None)
-                    marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["clat"][exam_name] = marks_val
-                elif "MHTCET" in exam_upper:
-                    marks = row.get(f'Total Marks{i}', None)
-                    marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["mhtcet"][exam_name] = marks_val
                 else:
                     marks = row.get(f'Total Marks{i}', None)
                     marks_val = "Absent" if pd.isna(marks) else remove_trailing_zeros(marks)
-                    exam_categories["nda"][exam_name] = marks_val
+                    exam_categories[family.category][exam_name] = marks_val
         
         # Generate messages for each category
         messages = {}
@@ -203,7 +170,7 @@ def process_data(df):
 
 def send_messages(file_path, status_label):
     try:
-        df = pd.read_csv(file_path) if file_path.endswith('.csv') else pd.read_excel(file_path)
+        df = read_frame(file_path)
         df.columns = df.columns.str.strip()
         
         processed_data = process_data(df)
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import pickle
+import time
+
+import pandas as pd
+
+try:
+    import python_calamine  # noqa: F401
+    FAST_EXCEL_ENGINE = 'calamine'
+except ImportError:
+    FAST_EXCEL_ENGINE = None
+
+CACHE_DIR = os.path.join('.cache', 'frames')
+CACHE_BUDGET_MB = 256
+
+# (path, mtime, size) -> content digest, so a file is hashed once per process
+_digests = {}
+
+
+def file_digest(file_path):
+    """blake2b digest of a file's bytes."""
+    stat = os.stat(file_path)
+    stamp = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if stamp not in _digests:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _digests[stamp] = digest.hexdigest()
+    return _digests[stamp]
+
+
+def cache_key(file_path, options):
+    """Content hash plus the read options that change the parsed frame."""
+    key = hashlib.blake2b(digest_size=16)
+    key.update(file_digest(file_path).encode())
+    key.update(repr(sorted(options.items())).encode())
+    return key.hexdigest()
+
+
+def select_columns(df, usecols):
+    if usecols is None:
+        return df
+    if callable(usecols):
+        return df[[col for col in df.columns if usecols(col)]]
+    wanted = set(usecols)
+    return df[[col for col in df.columns if col in wanted]]
+
+
+def evict(cache_dir=CACHE_DIR, budget_mb=CACHE_BUDGET_MB):
+    """Delete least recently used cache entries until the folder fits the budget."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    budget = budget_mb * 1024 ** 2
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def parse_file(file_path, options):
+    if file_path.lower().endswith('.csv'):
+        return pd.read_csv(file_path, **options)
+    return pd.read_excel(file_path, **options)
+
+
+def cached_read(file_path, usecols=None, cache_dir=CACHE_DIR, budget_mb=CACHE_BUDGET_MB, **options):
+    """Read a csv/Excel file through the on-disk parse cache.
+
+    Entries are keyed by (content hash, options). A list of usecols is
+    passed to the parser, so only those columns are parsed and cached, and
+    is part of the key; columns missing from the file are left out rather
+    than raising. xlsx files use the calamine engine when python-calamine
+    is installed.
+    """
+    file_path = str(file_path)
+    name = os.path.basename(file_path)
+    if FAST_EXCEL_ENGINE and file_path.lower().endswith('.xlsx'):
+        options.setdefault('engine', FAST_EXCEL_ENGINE)
+    parse_options = options
+    if usecols is not None and not callable(usecols):
+        wanted = set(usecols)
+        options = dict(options, usecols=sorted(wanted, key=str))
+        parse_options = dict(parse_options, usecols=lambda column: column in wanted)
+    # A callable can't be part of the key, so the whole sheet is cached and
+    # filtered afterwards; every callable selection shares that one entry
+    key = cache_key(file_path, options)
+    entry_path = os.path.join(cache_dir, key + '.pkl')
+
+    start = time.perf_counter()
+    if os.path.exists(entry_path):
+        try:
+            with open(entry_path, 'rb') as f:
+                df, parse_seconds = pickle.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry_path)
+            elapsed = time.perf_counter() - start
+            print(f"Loaded {name} from cache in {elapsed:.2f}s (saved {max(parse_seconds - elapsed, 0):.2f}s)")
+            return select_columns(df, usecols)
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry for {name}: {e}")
+
+    df = parse_file(file_path, parse_options)
+    parse_seconds = time.perf_counter() - start
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so pool workers never read a half-written entry
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump((df, parse_seconds), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+        evict(cache_dir, budget_mb)
+    except OSError as e:
+        print(f"Could not cache {name}: {e}")
+    print(f"Parsed {name} in {parse_seconds:.2f}s")
+    return select_columns(df, usecols)
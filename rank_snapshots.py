@@ -0,0 +1,194 @@
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_FOLDER = os.path.join('Output', 'rank_snapshots')
+# Each ranking script keeps its runs in its own subfolder
+AVERAGE_FOLDER = os.path.join(DEFAULT_FOLDER, 'super40_average')        # SUPER40_saad-rank.py
+PERCENTAGE_FOLDER = os.path.join(DEFAULT_FOLDER, 'super40_percentage')  # sup40 rank.py
+SCRIPT_FOLDERS = [AVERAGE_FOLDER, PERCENTAGE_FOLDER]
+RUNS_FILE = 'runs.csv'
+RUNS_COLUMNS = ['run_id', 'source', 'score_column', 'students', 'selected']
+SNAPSHOT_COLUMNS = ['run_id', 'NAME', 'CLASS', 'Score', 'Rank', 'Percentile', 'Selected']
+
+
+def make_run_id(source=None):
+    """Run ids sort by time, e.g. '2024-06-07_181502_ranklist'."""
+    stamp = time.strftime('%Y-%m-%d_%H%M%S')
+    if source:
+        stem = os.path.splitext(os.path.basename(source))[0].replace(' ', '_')
+        return f"{stamp}_{stem}"
+    return stamp
+
+
+def snapshot_frame(df, score_column, selected_names, name_column='NAME', class_column='CLASS'):
+    """One run's full ranking with rank and percentile, in compact dtypes."""
+    scores = pd.to_numeric(df[score_column], errors='coerce')
+    frame = pd.DataFrame({
+        'NAME': df[name_column].astype(str).to_numpy(),
+        'CLASS': (df[class_column] if class_column in df else pd.Series(np.nan, index=df.index)).to_numpy(),
+        'Score': scores.to_numpy(dtype=np.float32, na_value=np.nan),
+        # Both from one vectorised rank over the whole sheet
+        'Rank': scores.rank(ascending=False, method='min').to_numpy(),
+        'Percentile': (scores.rank(pct=True, method='max') * 100).to_numpy(dtype=np.float32, na_value=np.nan),
+    })
+    frame['Selected'] = frame['NAME'].isin(set(map(str, selected_names)))
+    # A name listed twice keeps its best row
+    frame = frame.sort_values('Rank', kind='stable').drop_duplicates('NAME')
+    frame['Rank'] = frame['Rank'].astype('Int32')
+    frame['CLASS'] = frame['CLASS'].astype('category')
+    return frame.reset_index(drop=True)
+
+
+class SnapshotStore:
+    """Ranking runs saved one pickle per run, listed in order in runs.csv.
+
+    Each ranking script should keep its own folder; runs are only compared
+    with earlier runs scored on the same column.
+    """
+
+    def __init__(self, folder=DEFAULT_FOLDER):
+        self.folder = folder
+        self.runs_path = os.path.join(folder, RUNS_FILE)
+        self._history = None
+
+    @property
+    def runs(self):
+        if not os.path.exists(self.runs_path):
+            return pd.DataFrame(columns=RUNS_COLUMNS)
+        runs = pd.read_csv(self.runs_path, dtype={'run_id': str, 'source': str, 'score_column': str},
+                           keep_default_na=False)
+        # runs.csv written before score_column was recorded
+        return runs.reindex(columns=RUNS_COLUMNS, fill_value='')
+
+    def record(self, df, score_column, selected_names, source=None, run_id=None, **columns):
+        """Save a run and return its run id."""
+        os.makedirs(self.folder, exist_ok=True)
+        run_id = run_id or make_run_id(source)
+        base_id, copy = run_id, 1
+        while os.path.exists(os.path.join(self.folder, f"{run_id}.pkl")):
+            copy += 1
+            run_id = f"{base_id}_{copy}"
+        frame = snapshot_frame(df, score_column, selected_names, **columns)
+        with open(os.path.join(self.folder, f"{run_id}.pkl"), 'wb') as f:
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        run = pd.DataFrame([{'run_id': run_id, 'source': source or '', 'score_column': score_column,
+                             'students': len(frame), 'selected': int(frame['Selected'].sum())}])
+        pd.concat([self.runs, run], ignore_index=True).to_csv(self.runs_path, index=False)
+        self._history = None
+        return run_id
+
+    def load(self, run_id):
+        with open(os.path.join(self.folder, f"{run_id}.pkl"), 'rb') as f:
+            return pickle.load(f)
+
+    def history(self):
+        """Every run in one long frame, indexed by (run_id, NAME)."""
+        if self._history is None:
+            run_ids = self.runs['run_id'].tolist()
+            frames = [self.load(run_id).assign(run_id=run_id) for run_id in run_ids]
+            if frames:
+                history = pd.concat(frames, ignore_index=True)
+            else:
+                history = pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+            history['run_id'] = pd.Categorical(history['run_id'], categories=run_ids, ordered=True)
+            history['CLASS'] = history['CLASS'].astype('category')
+            self._history = history[SNAPSHOT_COLUMNS].set_index(['run_id', 'NAME']).sort_index()
+        return self._history
+
+    def movement(self, previous_run=None, current_run=None):
+        """Compare two runs (default: the latest and the run before it on the same score column).
+
+        Returns (deltas, entered, exited): per-student score, rank and
+        percentile changes, and who moved into / out of the selection.
+        """
+        runs = self.runs
+        if current_run is None:
+            if not len(runs):
+                raise ValueError("At least two runs are needed to compare.")
+            current_run = runs['run_id'].iloc[-1]
+        if previous_run is None:
+            previous_run = self.previous_run(current_run)
+            if previous_run is None:
+                raise ValueError(f"No earlier run scored on the same column as {current_run}.")
+        history = self.history()
+        previous = history.xs(previous_run, level='run_id')
+        current = history.xs(current_run, level='run_id')
+        deltas = current.join(previous, how='outer', lsuffix='', rsuffix=' (prev)')
+        deltas['Score Change'] = deltas['Score'] - deltas['Score (prev)']
+        deltas['Rank Change'] = deltas['Rank (prev)'] - deltas['Rank']
+        deltas['Percentile Change'] = deltas['Percentile'] - deltas['Percentile (prev)']
+        was_selected = deltas['Selected (prev)'].fillna(False).astype(bool)
+        is_selected = deltas['Selected'].fillna(False).astype(bool)
+        entered = deltas[is_selected & ~was_selected]
+        exited = deltas[was_selected & ~is_selected]
+        return deltas.reset_index(), entered.reset_index(), exited.reset_index()
+
+    def previous_run(self, run_id):
+        """The latest run before run_id with the same score column, or None."""
+        runs = self.runs
+        position = runs.index[runs['run_id'] == run_id]
+        if not len(position):
+            raise ValueError(f"Unknown run {run_id}")
+        earlier = runs.loc[:position[0] - 1]
+        earlier = earlier[earlier['score_column'] == runs.at[position[0], 'score_column']]
+        return earlier['run_id'].iloc[-1] if len(earlier) else None
+
+    def trends(self):
+        """Week-over-week changes for every student across all runs at once."""
+        history = self.history().reset_index().sort_values(['NAME', 'run_id'], kind='stable')
+        by_student = history.groupby('NAME', sort=False, observed=True)
+        history['Score Change'] = by_student['Score'].diff()
+        history['Rank Change'] = -by_student['Rank'].diff()
+        history['Percentile Change'] = by_student['Percentile'].diff()
+        return history.reset_index(drop=True)
+
+
+def print_movement(store):
+    """Print who entered and left the selection since the previous run."""
+    runs = store.runs
+    if len(runs) < 2 or store.previous_run(runs['run_id'].iloc[-1]) is None:
+        return
+    _, entered, exited = store.movement()
+    print(f"\nSince the previous run: {len(entered)} entered, {len(exited)} left the selection")
+    if len(entered):
+        print("Entered:", ', '.join(entered['NAME']))
+    if len(exited):
+        print("Left:", ', '.join(exited['NAME']))
+
+
+def write_report(store):
+    """Write rank_movement.xlsx and rank_trends.csv into the store's folder."""
+    runs = store.runs
+    if len(runs) < 2 or store.previous_run(runs['run_id'].iloc[-1]) is None:
+        print(f"{len(runs)} run(s) recorded in {store.folder}; "
+              "at least two on the same score column are needed for a report.")
+        return
+    start = time.perf_counter()
+    deltas, entered, exited = store.movement()
+    trends = store.trends()
+    output_path = os.path.join(store.folder, 'rank_movement.xlsx')
+    with pd.ExcelWriter(output_path) as writer:
+        deltas.sort_values('Rank').to_excel(writer, sheet_name='Latest Changes', index=False)
+        entered.to_excel(writer, sheet_name='Entered', index=False)
+        exited.to_excel(writer, sheet_name='Exited', index=False)
+    # A year of weekly runs can pass Excel's row limit, so the full history goes to CSV
+    trends_path = os.path.join(store.folder, 'rank_trends.csv')
+    trends.to_csv(trends_path, index=False)
+    print(f"Compared {len(runs)} runs in {time.perf_counter() - start:.2f}s")
+    print(f"Movement report saved to {output_path}, full history to {trends_path}")
+
+
+def main():
+    # A folder on the command line, otherwise one report per ranking script
+    folders = sys.argv[1:] or SCRIPT_FOLDERS
+    for folder in folders:
+        write_report(SnapshotStore(folder))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from apportionment import apportion, super40_priority
+from exam_schema import columns_by_family
+from sidecar import read_frame
+from super40_scoring import score_matrix
+
+# How to turn a category's top-k total into a comparable score:
+#   raw       the total itself
+#   max       percentage of the category maximum (max_marks, scaled to top_k exams)
+#   observed  percentage of the best total anyone achieved
+#   zscore    standard score within the sheet
+NORMALISE_MODES = ['raw', 'max', 'observed', 'zscore']
+QUOTA_METHODS = ['equal', 'proportional', 'dhondt', 'none']
+
+RankingConfig = namedtuple('RankingConfig', [
+    'weights', 'top_k', 'normalise', 'max_marks', 'total_students', 'exclude_class', 'quota',
+])
+
+# Maximum marks of the top-4 totals, as used by the SUPER40 percentage ranking
+SUPER40_MAX_MARKS = {'GAT': 1200, 'MATHS': 752, 'Subjective': 100}
+SUBJECTIVE_COLUMNS = [f'Subjective Marks{i}' for i in range(1, 6)]
+
+# "sup40 rank.py": mean of the three category percentages, equal class quotas
+SUPER40_PERCENTAGE = RankingConfig(
+    weights={'GAT': 1 / 3, 'MATHS': 1 / 3, 'Subjective': 1 / 3}, top_k=4, normalise='max',
+    max_marks=SUPER40_MAX_MARKS, total_students=40, exclude_class='XI- JEE/NEET', quota='equal')
+# "SUPER40_saad-rank.py": Grand Total / 3, quotas proportional to class size (largest remainder)
+SUPER40_AVERAGE = SUPER40_PERCENTAGE._replace(normalise='raw', quota='proportional')
+
+
+def super40_categories(df):
+    """The GAT / MATHS / Subjective score columns of a SUPER40 sheet."""
+    family_columns = columns_by_family(df)
+    return {
+        'GAT': family_columns.get('GAT', []),
+        'MATHS': family_columns.get('MATHS', []),
+        'Subjective': SUBJECTIVE_COLUMNS,
+    }
+
+
+def class_quotas(class_sizes, total_students, method='equal'):
+    """Seats per class (a dict) for the given quota method.
+
+    'equal' gives every class total // n seats and hands the remainder to
+    classes 1, 2, 3, 5, 4, 6, ... in name order, the SUPER40 convention.
+    'proportional' splits seats by class size (largest remainder) and
+    'dhondt' by highest averages.
+    """
+    if not class_sizes or method == 'none':
+        return {}
+    if method == 'equal':
+        return apportion(class_sizes, total_students, 'equal', priority=super40_priority(class_sizes))
+    if method == 'proportional':
+        return apportion(class_sizes, total_students, 'hamilton')
+    if method == 'dhondt':
+        return apportion(class_sizes, total_students, 'dhondt')
+    raise ValueError(f"Unknown quota method '{method}'. Use one of {QUOTA_METHODS}.")
+
+
+class RankingEngine:
+    """Re-rank a results sheet under different selection criteria.
+
+    Every category's scores are parsed once and sorted best-first per
+    student; running totals along that order give the top-k total for any k
+    by a single column lookup. Evaluating a RankingConfig is then a handful
+    of vector operations, fast enough to try criteria interactively.
+    """
+
+    def __init__(self, df, categories, class_column='CLASS'):
+        self.df = df.reset_index(drop=True)
+        self.categories = categories
+        self.class_column = class_column
+        self.classes = self.df[class_column].to_numpy(dtype=object) if class_column in self.df else None
+
+        self._top_totals = {}
+        for category, columns in categories.items():
+            matrix = score_matrix(self.df, columns)
+            # Best score first, missing exams last, then running totals
+            ordered = -np.sort(np.where(np.isnan(matrix), np.inf, -matrix), axis=1)
+            ordered[np.isinf(ordered)] = 0.0
+            self._top_totals[category] = np.cumsum(ordered, axis=1)
+
+    def totals(self, category, top_k):
+        """Sum of each student's top_k scores in one category."""
+        top_totals = self._top_totals[category]
+        if top_totals.shape[1] == 0 or top_k <= 0:
+            return np.zeros(len(self.df))
+        return top_totals[:, min(top_k, top_totals.shape[1]) - 1]
+
+    def normalised(self, category, config):
+        totals = self.totals(category, config.top_k)
+        if config.normalise == 'raw':
+            return totals
+        if config.normalise == 'max':
+            # Maxima are given for 4 exams; scale them to the chosen top_k
+            return totals / (config.max_marks[category] * config.top_k / 4) * 100
+        if config.normalise == 'observed':
+            best = totals.max() if len(totals) else 0
+            return totals / best * 100 if best > 0 else np.zeros_like(totals)
+        if config.normalise == 'zscore':
+            std = totals.std()
+            return (totals - totals.mean()) / std if std > 0 else np.zeros_like(totals)
+        raise ValueError(f"Unknown normalisation '{config.normalise}'. Use one of {NORMALISE_MODES}.")
+
+    def evaluate(self, config):
+        """Per-category totals, normalised scores and the weighted Score."""
+        columns = {}
+        score = np.zeros(len(self.df))
+        for category, weight in config.weights.items():
+            columns[f'Total {category} (Top {config.top_k})'] = self.totals(category, config.top_k)
+            normalised = self.normalised(category, config)
+            columns[f'{category} Score'] = normalised
+            score += weight * normalised
+        columns['Score'] = score
+        return pd.DataFrame(columns)
+
+    def rank(self, config):
+        """Select students under config and return them best-first with their scores."""
+        scores = self.evaluate(config)
+        eligible = np.ones(len(self.df), dtype=bool)
+        if self.classes is not None and config.exclude_class is not None:
+            eligible = self.classes != config.exclude_class
+        candidates = np.flatnonzero(eligible)
+        # Best score first; ties keep sheet order, like nlargest(keep='first')
+        candidates = candidates[np.argsort(-scores['Score'].to_numpy()[candidates], kind='stable')]
+
+        if self.classes is None or config.quota == 'none':
+            selected = candidates[:config.total_students]
+        else:
+            candidate_classes = pd.Series(self.classes[candidates])
+            quotas = class_quotas(candidate_classes.value_counts().to_dict(), config.total_students, config.quota)
+            position_in_class = candidate_classes.groupby(candidate_classes).cumcount().to_numpy()
+            seats = candidate_classes.map(quotas).fillna(0).to_numpy()
+            selected = candidates[position_in_class < seats]
+
+        result = pd.concat([self.df.iloc[selected].reset_index(drop=True),
+                            scores.iloc[selected].reset_index(drop=True)], axis=1)
+        result.insert(0, 'Rank', np.arange(1, len(result) + 1))
+        return result
+
+
+def parse_weights(text, categories):
+    """'GAT=2 MATHS=1' or '2,1,1' (in category order) -> weights dict.
+
+    Raises ValueError for unknown category names or too many weights.
+    """
+    names = list(categories)
+    by_upper = {name.upper(): name for name in names}
+    weights = {}
+    parts = text.replace(',', ' ').split()
+    if not parts:
+        raise ValueError("no weights given")
+    for position, part in enumerate(parts):
+        if '=' in part:
+            name, value = part.split('=', 1)
+            if name.strip().upper() not in by_upper:
+                raise ValueError(f"unknown category '{name.strip()}', use one of {names}")
+            name = by_upper[name.strip().upper()]
+        elif position < len(names):
+            name, value = names[position], part
+        else:
+            raise ValueError(f"{len(parts)} weights given for {len(names)} categories {names}")
+        weights[name] = float(value)
+    return weights
+
+
+def main():
+    if len(sys.argv) > 1:
+        file_path = ' '.join(sys.argv[1:]).strip().strip('\'"& ')
+    else:
+        file_path = input("Drag and drop the SUPER40 results file and press Enter: ").strip().strip('\'"& ')
+    if not os.path.exists(file_path):
+        print(f"Error: File '{file_path}' does not exist.")
+        return
+    df = read_frame(file_path)
+
+    start = time.perf_counter()
+    categories = super40_categories(df)
+    engine = RankingEngine(df, categories)
+    print(f"Prepared {len(df)} students in {time.perf_counter() - start:.3f}s")
+
+    config = SUPER40_PERCENTAGE
+    while True:
+        start = time.perf_counter()
+        ranked = engine.rank(config)
+        elapsed = (time.perf_counter() - start) * 1000
+        shown = ['Rank', 'NAME', 'CLASS'] + [col for col in ranked.columns if col.endswith('Score')]
+        print(ranked[[col for col in shown if col in ranked.columns]].head(config.total_students).to_string(index=False))
+        print(f"\nweights={config.weights} top_k={config.top_k} normalise={config.normalise} "
+              f"quota={config.quota} total={config.total_students} ({elapsed:.1f} ms)")
+
+        command = input("\nChange: weights <w...> | topk <k> | normalise <mode> | quota <method> | "
+                        "total <n> | save | quit: ").strip()
+        name, _, value = command.partition(' ')
+        name = name.lower()
+        try:
+            if name == 'weights':
+                config = config._replace(weights=parse_weights(value, categories))
+            elif name == 'topk':
+                config = config._replace(top_k=int(value))
+            elif name == 'normalise' and value in NORMALISE_MODES:
+                config = config._replace(normalise=value)
+            elif name == 'quota' and value in QUOTA_METHODS:
+                config = config._replace(quota=value)
+            elif name == 'total':
+                config = config._replace(total_students=int(value))
+            elif name == 'save':
+                output_file = os.path.splitext(file_path)[0] + "_ranking.xlsx"
+                ranked.to_excel(output_file, index=False)
+                print(f"Ranking saved to: {output_file}")
+            elif name in ('quit', 'exit', ''):
+                break
+            else:
+                print("Unknown command.")
+        except ValueError as e:
+            print(f"Invalid value: {e}")
+
+
+if __name__ == "__main__":
+    main()
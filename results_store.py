@@ -0,0 +1,236 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from exam_schema import EXAM_FAMILIES, parse_wide_column
+from sidecar import read_frame
+
+STORE_COLUMNS = ['student_id', 'exam_id', 'component', 'marks', 'date']
+KEY_COLUMNS = ['student_id', 'exam_id', 'component']
+DEFAULT_STORE = 'results_store.csv'
+# Contact columns the senders (obwhatsend.py) read next to the marks
+CONTACT_COLUMNS = ['Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']
+
+# Component column order inside one exam of the wide layout
+COMPONENT_ORDER = ['Total Marks'] + [component for family in EXAM_FAMILIES
+                                     for component in family.components if component != 'Total Marks']
+
+
+def clean_file_path(file_path):
+    # Remove leading & trailing spaces and drag-and-drop artifacts
+    return file_path.strip().strip('\'"& ')
+
+
+def contacts_path(store_path):
+    """Latest contact numbers per student are kept next to the store, e.g. results_store_contacts.csv."""
+    stem, ext = os.path.splitext(store_path)
+    return f"{stem}_contacts{ext or '.csv'}"
+
+
+def phone_text(series):
+    """Phone numbers as text, without the '.0' a float column adds."""
+    return series.astype('string').str.strip().str.replace(r'\.0$', '', regex=True)
+
+
+def wide_to_long(df, exam_dates=None, id_column='Name'):
+    """Convert a wide aligner sheet (Exam{i}, Total Marks{i}, GAT{i}, ...) to store rows.
+
+    exam_dates optionally maps an exam name to its date. A student gets a row
+    per component for every exam whose Exam{i} label is filled in; missing
+    marks stay NaN so the student still shows as Absent.
+    """
+    exams = {}
+    for column in df.columns:
+        parsed = parse_wide_column(column)
+        if parsed is None:
+            continue
+        prefix, number = parsed
+        exams.setdefault(number, {'label': None, 'components': []})
+        if prefix == 'Exam':
+            exams[number]['label'] = column
+        else:
+            exams[number]['components'].append((prefix, column))
+
+    frames = []
+    for number in sorted(exams):
+        label_column = exams[number]['label']
+        if label_column is None:
+            continue
+        present = df[label_column].notna()
+        for component, column in exams[number]['components']:
+            frames.append(pd.DataFrame({
+                'student_id': df.loc[present, id_column].astype(str).to_numpy(),
+                'exam_id': df.loc[present, label_column].astype(str).to_numpy(),
+                'component': component,
+                'marks': pd.to_numeric(df.loc[present, column], errors='coerce').to_numpy(),
+            }))
+    if not frames:
+        return pd.DataFrame(columns=STORE_COLUMNS)
+    long_df = pd.concat(frames, ignore_index=True)
+    exam_dates = exam_dates or {}
+    long_df['date'] = pd.to_datetime(long_df['exam_id'].map(exam_dates))
+    return long_df[STORE_COLUMNS]
+
+
+class ResultsStore:
+    """Append-only long-format exam results with student and exam indexes.
+
+    Rows are appended to a CSV file, so adding an exam never rewrites
+    existing results. Sorted views by student and by exam are rebuilt lazily
+    after appends; lookups then binary-search them in O(log n). Each
+    student's latest contact numbers are kept in a small side file so the
+    wide view can be fed straight to the senders.
+    """
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        if os.path.exists(path):
+            self._frame = pd.read_csv(path, dtype={'student_id': str, 'exam_id': str, 'component': str},
+                                      parse_dates=['date'])
+        else:
+            self._frame = pd.DataFrame(columns=STORE_COLUMNS)
+        self.contacts_path = contacts_path(path)
+        if os.path.exists(self.contacts_path):
+            self.contacts = pd.read_csv(self.contacts_path, dtype=str)
+        else:
+            self.contacts = pd.DataFrame(columns=['student_id'] + CONTACT_COLUMNS)
+        self._pending = []
+        self._indexed = False
+
+    def append(self, results):
+        """Append store rows (STORE_COLUMNS) to the file and the in-memory table."""
+        results = results[STORE_COLUMNS]
+        if results.empty:
+            return 0
+        results.to_csv(self.path, mode='a', header=not os.path.exists(self.path), index=False,
+                       date_format='%Y-%m-%d')
+        self._pending.append(results)
+        self._indexed = False
+        return len(results)
+
+    def append_wide(self, df, exam_dates=None, id_column='Name'):
+        """Append the results of a wide sheet that are not stored yet.
+
+        A result is new unless the same (student, exam, component) is already
+        stored, so a later sheet with more students for a known exam still
+        adds them. Contact columns in the sheet update the contacts file.
+        """
+        self.update_contacts(df, id_column)
+        results = wide_to_long(df, exam_dates, id_column).drop_duplicates(KEY_COLUMNS, keep='last')
+        known = pd.MultiIndex.from_frame(self.frame[KEY_COLUMNS].astype(str))
+        new = ~pd.MultiIndex.from_frame(results[KEY_COLUMNS].astype(str)).isin(known)
+        return self.append(results[new])
+
+    def update_contacts(self, df, id_column='Name'):
+        """Remember each student's latest contact numbers from a sheet."""
+        columns = [column for column in CONTACT_COLUMNS if column in df.columns]
+        if not columns or id_column not in df.columns:
+            return
+        latest = pd.DataFrame({'student_id': df[id_column].astype(str)})
+        for column in columns:
+            latest[column] = phone_text(df[column])
+        latest = latest[df[id_column].notna().to_numpy()]
+        contacts = pd.concat([self.contacts, latest], ignore_index=True)
+        # A blank number in the new sheet doesn't erase a known one
+        contacts = contacts.groupby('student_id', sort=False).last().reset_index()
+        self.contacts = contacts.reindex(columns=['student_id'] + CONTACT_COLUMNS)
+        self.contacts.to_csv(self.contacts_path, index=False)
+
+    @property
+    def frame(self):
+        if self._pending:
+            frames = [frame for frame in [self._frame] + self._pending if not frame.empty]
+            self._frame = pd.concat(frames, ignore_index=True)
+            self._pending = []
+        return self._frame
+
+    def _build_index(self):
+        # Row position doubles as append order, used to keep exams in the order they arrived
+        frame = self.frame.assign(_seq=np.arange(len(self.frame)))
+        self._by_student = frame.sort_values(['student_id', 'date', '_seq'], kind='stable')
+        self._student_keys = self._by_student['student_id'].to_numpy(dtype=str)
+        self._by_exam = frame.sort_values(['exam_id', 'student_id'], kind='stable')
+        self._exam_keys = self._by_exam['exam_id'].to_numpy(dtype=str)
+        self._indexed = True
+
+    @staticmethod
+    def _slice(sorted_frame, keys, value):
+        start = np.searchsorted(keys, value, side='left')
+        stop = np.searchsorted(keys, value, side='right')
+        return sorted_frame.iloc[start:stop].drop(columns='_seq')
+
+    def student_history(self, student_id):
+        """All results for one student, oldest first."""
+        if not self._indexed:
+            self._build_index()
+        return self._slice(self._by_student, self._student_keys, str(student_id))
+
+    def exam_results(self, exam_id):
+        """All results for one exam, by student."""
+        if not self._indexed:
+            self._build_index()
+        return self._slice(self._by_exam, self._exam_keys, str(exam_id))
+
+    def to_wide(self, exam_ids=None, id_column='Name'):
+        """Pivot the store back to the wide Exam{i}/Total Marks{i}/GAT{i} layout.
+
+        Exams are numbered by date, then by the order they were appended.
+        The contact columns follow the name, as obwhatsend.py expects (blank
+        for students whose numbers were never imported).
+        """
+        frame = self.frame
+        if exam_ids is not None:
+            frame = frame[frame['exam_id'].isin(exam_ids)]
+        if frame.empty:
+            return pd.DataFrame(columns=[id_column] + CONTACT_COLUMNS)
+
+        frame = frame.assign(_seq=np.arange(len(frame)))
+        exam_order = frame.groupby('exam_id', sort=False).agg(date=('date', 'min'), first=('_seq', 'min'))
+        exam_order = exam_order.sort_values(['date', 'first'], na_position='last')
+        numbers = pd.Series(np.arange(1, len(exam_order) + 1), index=exam_order.index)
+        frame['_number'] = frame['exam_id'].map(numbers)
+
+        labels = frame.drop_duplicates(['student_id', '_number'], keep='last').pivot(
+            index='student_id', columns='_number', values='exam_id')
+        labels.columns = [f'Exam{number}' for number in labels.columns]
+        marks = frame.pivot_table(index='student_id', columns=['_number', 'component'], values='marks',
+                                  aggfunc='last', dropna=False)
+        # Keep only the components each exam actually has, even if every mark is missing
+        present = pd.MultiIndex.from_frame(frame[['_number', 'component']].drop_duplicates())
+        marks = marks.loc[:, marks.columns.isin(present)]
+        marks.columns = [f'{component}{number}' for number, component in marks.columns]
+
+        wide = labels.join(marks)
+        rank = {component: position for position, component in enumerate(COMPONENT_ORDER)}
+
+        def column_key(column):
+            prefix, number = parse_wide_column(column)
+            return number, -1 if prefix == 'Exam' else rank.get(prefix, len(rank))
+
+        wide = wide[sorted(wide.columns, key=column_key)]
+        contacts = self.contacts.set_index('student_id').reindex(wide.index)[CONTACT_COLUMNS]
+        return contacts.join(wide).rename_axis(id_column).reset_index()
+
+
+def main():
+    store = ResultsStore()
+    print(f"Results store: {store.path} ({len(store.frame)} rows)")
+    choice = input("Type 'import' to add a wide sheet, 'export' to write the wide layout, "
+                   "or a student name to see their history: ").strip()
+    if choice.lower() == 'import':
+        file_path = clean_file_path(input("Drag and drop the wide results file into the terminal: "))
+        df = read_frame(file_path)
+        added = store.append_wide(df)
+        print(f"Added {added} result rows to {store.path}")
+    elif choice.lower() == 'export':
+        os.makedirs('Output', exist_ok=True)
+        output_path = os.path.join('Output', 'results_wide.xlsx')
+        store.to_wide().to_excel(output_path, index=False)
+        print(f"Wide results saved to {output_path}")
+    elif choice:
+        print(store.student_history(choice).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
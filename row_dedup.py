@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+
+# Odd 64-bit multiplier used to mix column hashes into one row fingerprint
+MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalise_values(values):
+    """Text form of non-blank values for duplicate checks.
+
+    Case and runs of whitespace are ignored, and numbers compare by value
+    whether they were read as 5, 5.0 or '5'.
+    """
+    if pd.api.types.is_bool_dtype(values):
+        # 'true' / 'false', as the text path below gives for bools in an object column
+        return values.astype(str).str.casefold().astype(object)
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = values.astype('float64')
+        text = numbers.astype(str)
+    else:
+        text = (values.astype('string').str.strip()
+                .str.replace(r'\s+', ' ', regex=True).str.casefold().astype(object))
+        numbers = pd.to_numeric(text.where(text != ''), errors='coerce')
+        text = text.where(numbers.isna(), numbers.astype(str))
+    whole = numbers.notna() & np.isfinite(numbers) & (numbers % 1 == 0) & (numbers.abs() < 2 ** 53)
+    return text.where(~whole, numbers.where(whole, 0).astype('int64').astype(str)).astype(object)
+
+
+def column_hashes(series):
+    """64-bit hash of each row's normalised value; only distinct values are normalised."""
+    codes, uniques = pd.factorize(series)
+    canonical = normalise_values(pd.Series(uniques)).to_numpy(dtype=object)
+    # Blanks (code -1) hash like an empty string
+    hashes = pd.util.hash_array(np.append(canonical, ''))
+    return hashes[codes]
+
+
+def row_fingerprints(df, key_columns=None):
+    """One 64-bit fingerprint per row from the normalised key columns (default: all columns)."""
+    columns = list(df.columns) if key_columns is None else [column for column in key_columns if column in df.columns]
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    for column in columns:
+        fingerprints = (fingerprints * MIX) ^ column_hashes(df[column])
+    return fingerprints
+
+
+class RowDeduplicator:
+    """Drop rows already seen, file by file, keeping the first copy.
+
+    Only the sorted fingerprints of kept rows are held between files, so
+    duplicates never have to be concatenated before they are dropped.
+    Removed rows are kept for a report, with the file they came from and
+    the file whose copy was kept.
+    """
+
+    def __init__(self, key_columns=None):
+        self.key_columns = key_columns
+        self.fingerprints = np.empty(0, dtype=np.uint64)
+        self.origins = np.empty(0, dtype=np.int32)
+        self.sources = []
+        self.removed = []
+
+    def filter(self, df, source):
+        """The rows of df not seen before (in earlier files or earlier in df)."""
+        source_index = len(self.sources)
+        self.sources.append(str(source))
+        fingerprints = row_fingerprints(df, self.key_columns)
+
+        if len(self.fingerprints):
+            positions = np.searchsorted(self.fingerprints, fingerprints)
+            clipped = np.minimum(positions, len(self.fingerprints) - 1)
+            seen = self.fingerprints[clipped] == fingerprints
+            seen_in = self.origins[clipped]
+        else:
+            seen = np.zeros(len(df), dtype=bool)
+            seen_in = np.zeros(len(df), dtype=np.int32)
+        repeated = pd.Series(fingerprints).duplicated().to_numpy()
+        keep = ~seen & ~repeated
+
+        if not keep.all():
+            removed = df[~keep].copy()
+            origins = np.where(seen, seen_in, source_index)[~keep]
+            removed.insert(0, 'Duplicate Of', np.asarray(self.sources, dtype=object)[origins])
+            removed.insert(0, 'Source', self.sources[source_index])
+            self.removed.append(removed)
+
+        order = np.argsort(np.concatenate([self.fingerprints, fingerprints[keep]]), kind='stable')
+        self.fingerprints = np.concatenate([self.fingerprints, fingerprints[keep]])[order]
+        self.origins = np.concatenate([self.origins, np.full(int(keep.sum()), source_index, dtype=np.int32)])[order]
+        return df[keep]
+
+    def report(self):
+        """Every removed row with its Source and the Duplicate Of file that kept it."""
+        if not self.removed:
+            return pd.DataFrame(columns=['Source', 'Duplicate Of'])
+        return pd.concat(self.removed, ignore_index=True)
+
+
+def drop_duplicate_rows(frames, key_columns=None):
+    """Deduplicate a list of (source, DataFrame) in order; returns (combined, removed)."""
+    columns = []
+    for _, df in frames:
+        columns.extend(column for column in df.columns if column not in columns)
+    deduplicator = RowDeduplicator(key_columns)
+    # Align every file to the same columns so fingerprints are comparable across files
+    kept = [deduplicator.filter(df.reindex(columns=columns), source) for source, df in frames]
+    combined = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns)
+    return combined, deduplicator.report()
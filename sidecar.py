@@ -0,0 +1,129 @@
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from parse_cache import cached_read, file_digest, select_columns
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Sidecars sit next to the workbook they mirror, e.g. "Output/all_merged_data.xlsx.parquet"
+SIDECAR_EXTENSIONS = ['.parquet', '.pkl']
+# The workbook's size, mtime and content digest when its sidecar was written
+STAMP_EXTENSION = '.sidecar.json'
+
+
+def sidecar_paths(file_path):
+    return [file_path + extension for extension in SIDECAR_EXTENSIONS]
+
+
+def remove_sidecars(file_path):
+    for path in sidecar_paths(file_path) + [file_path + STAMP_EXTENSION]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def source_stamp(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_stamp(file_path):
+    stamp = dict(source_stamp(file_path), digest=file_digest(file_path))
+    with open(file_path + STAMP_EXTENSION, 'w') as f:
+        json.dump(stamp, f)
+
+
+def is_fresh(file_path):
+    """True if the workbook is the one the sidecar was written from.
+
+    Size and mtime must match exactly, so a copy or restore with an older
+    mtime is caught; if only they differ, an unchanged digest still counts.
+    """
+    try:
+        with open(file_path + STAMP_EXTENSION) as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    current = source_stamp(file_path)
+    if current == {'size': stamp.get('size'), 'mtime_ns': stamp.get('mtime_ns')}:
+        return True
+    return current['size'] == stamp.get('size') and file_digest(file_path) == stamp.get('digest')
+
+
+def write_sidecar(df, file_path):
+    """Save a columnar copy of df next to file_path and return its path.
+
+    Parquet is used when pyarrow is installed and can store every column;
+    otherwise (mixed-type object columns, no pyarrow) the frame is pickled.
+    """
+    remove_sidecars(file_path)
+    parquet_path, pickle_path = sidecar_paths(file_path)
+    sidecar_path = None
+    if HAS_PYARROW:
+        try:
+            df.to_parquet(parquet_path, index=False)
+            sidecar_path = parquet_path
+        except (TypeError, ValueError, ImportError) as e:
+            print(f"Parquet sidecar not possible for {os.path.basename(file_path)} ({e}), using pickle")
+            if os.path.exists(parquet_path):
+                os.remove(parquet_path)
+    if sidecar_path is None:
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(df.reset_index(drop=True), f, protocol=pickle.HIGHEST_PROTOCOL)
+        sidecar_path = pickle_path
+    write_stamp(file_path)
+    return sidecar_path
+
+
+def read_sidecar(file_path, usecols=None):
+    """Return the sidecar frame for file_path, or None if there is no fresh one.
+
+    A sidecar is fresh only while the workbook matches the stamp written
+    with it (see is_fresh), so a file edited by hand, or replaced by an
+    older copy, is read from the workbook again.
+    """
+    if not os.path.exists(file_path) or not is_fresh(file_path):
+        return None
+    for path in sidecar_paths(file_path):
+        if not os.path.exists(path):
+            continue
+        try:
+            if path.endswith('.parquet'):
+                if not HAS_PYARROW:
+                    continue
+                df = pd.read_parquet(path)
+            else:
+                with open(path, 'rb') as f:
+                    df = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable sidecar {path}: {e}")
+            continue
+        return select_columns(df, usecols)
+    return None
+
+
+def write_frame(df, file_path, **kwargs):
+    """Write df as xlsx/xls/csv (by extension) plus its columnar sidecar."""
+    lower = file_path.lower()
+    if lower.endswith('.xlsx'):
+        df.to_excel(file_path, index=False, **kwargs)
+    elif lower.endswith('.xls'):
+        df.to_excel(file_path, index=False, engine='xlwt', **kwargs)
+    else:
+        df.to_csv(file_path, index=False, **kwargs)
+    write_sidecar(df, file_path)
+    return file_path
+
+
+def read_frame(file_path, usecols=None):
+    """Read a csv/Excel file, preferring a fresh sidecar, then the parse cache."""
+    df = read_sidecar(file_path, usecols)
+    if df is not None:
+        return df
+    return cached_read(file_path, usecols=usecols)
@@ -0,0 +1,227 @@
+import csv
+import os
+import time
+from operator import itemgetter
+
+import openpyxl
+
+from name_matcher import normalize_name
+
+# Columns of the first file that lead the output, matched case-insensitively
+PRIORITY_COLUMNS = ['ROLL NO.', 'NAME', 'BATCH', 'CLASS', 'ADMISSION DONE BY', 'DOJ']
+DEFAULT_KEYS = ['NAME']
+
+
+def clean_value(value):
+    return '' if value is None else str(value).strip()
+
+
+class SheetReader:
+    """Stream a sheet's rows as tuples of stripped strings; .xlsx is opened read-only."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.is_excel = os.path.splitext(file_path)[1].lower() == '.xlsx'
+        if self.is_excel:
+            self.workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            self.rows = self.workbook.active.iter_rows(values_only=True)
+        else:
+            self.file = open(file_path, 'r', encoding='utf-8-sig', newline='')
+            self.rows = csv.reader(self.file)
+        header = next(self.rows, None) or []
+        # Columns without a header are dropped; a repeated header keeps its first column
+        self.headers, self.positions = [], []
+        for position, name in enumerate(header):
+            name = clean_value(name)
+            if name and name not in self.headers:
+                self.headers.append(name)
+                self.positions.append(position)
+        self.width = len(self.headers)
+        self.pick = itemgetter(*self.positions) if self.positions else None
+
+    def __iter__(self):
+        pad = ('',) * (max(self.positions, default=-1) + 1)
+        for row in self.rows:
+            if len(row) < len(pad):
+                row = tuple(row) + pad[len(row):]
+            values = self.pick(row) if self.width > 1 else ((self.pick(row),) if self.pick else ())
+            yield tuple(clean_value(value) for value in values)
+
+    def close(self):
+        if self.is_excel:
+            self.workbook.close()
+        else:
+            self.file.close()
+
+
+def key_positions(headers, keys, file_path):
+    """Positions of the key columns in headers, matched case-insensitively."""
+    upper = {header.upper(): position for position, header in reversed(list(enumerate(headers)))}
+    missing = [key for key in keys if key.upper() not in upper]
+    if missing:
+        raise ValueError(f"{file_path} has no {', '.join(missing)} column")
+    return [upper[key.upper()] for key in keys]
+
+
+def make_key(row, positions):
+    return tuple(normalize_name(row[position]) for position in positions)
+
+
+def compile_plan(header_lists, priority_columns=PRIORITY_COLUMNS):
+    """Output headers and where each comes from, worked out once for all files.
+
+    The first file's priority columns lead, then each further file's new
+    columns in file order, then the rest of the first file. Returns
+    (headers, positions) where positions index the concatenation of one
+    row from every file.
+    """
+    priority_upper = {column.upper() for column in priority_columns}
+    first = header_lists[0]
+    by_upper = {}
+    for header in first:
+        by_upper.setdefault(header.upper(), header)
+    priority = [by_upper[column.upper()] for column in priority_columns if column.upper() in by_upper]
+    priority_set = set(priority)
+
+    offsets = [0]
+    for headers in header_lists[:-1]:
+        offsets.append(offsets[-1] + len(headers))
+
+    output = [(header, first.index(header)) for header in priority]
+    taken = set(first)
+    for offset, headers in zip(offsets[1:], header_lists[1:]):
+        for position, header in enumerate(headers):
+            if header.upper() not in priority_upper and header not in taken:
+                output.append((header, offset + position))
+                taken.add(header)
+    output += [(header, position) for position, header in enumerate(first) if header not in priority_set]
+    return [header for header, _ in output], [position for _, position in output]
+
+
+class OutputWriter:
+    """Write rows as they come: a write-only workbook for .xlsx, otherwise CSV."""
+
+    def __init__(self, file_path, headers):
+        self.is_excel = os.path.splitext(file_path)[1].lower() == '.xlsx'
+        self.file_path = file_path
+        if self.is_excel:
+            self.workbook = openpyxl.Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet()
+            self.sheet.append(headers)
+        else:
+            self.file = open(file_path, 'w', newline='', encoding='utf-8')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(headers)
+
+    def append(self, row):
+        if self.is_excel:
+            self.sheet.append(row)
+        else:
+            self.writer.writerow(row)
+
+    def close(self):
+        if self.is_excel:
+            self.workbook.save(self.file_path)
+        else:
+            self.file.close()
+
+    def discard(self):
+        """Abandon the output, removing anything already written."""
+        if self.is_excel:
+            self.sheet.close()
+            self.workbook.close()
+        else:
+            self.file.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+
+def index_file(file_path, keys):
+    """Read a lookup file into {key: row}; the last row wins, duplicates are counted."""
+    reader = SheetReader(file_path)
+    try:
+        positions = key_positions(reader.headers, keys, file_path)
+        index = {}
+        duplicates = {}
+        rows = 0
+        for row in reader:
+            rows += 1
+            key = make_key(row, positions)
+            if not any(key):
+                continue
+            if key in index:
+                duplicates[key] = duplicates.get(key, 1) + 1
+            index[key] = row
+        return reader.headers, index, duplicates, rows
+    finally:
+        reader.close()
+
+
+def write_duplicate_report(report_path, keys, duplicates):
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['File'] + list(keys) + ['Rows'])
+        for file_path, counts in duplicates:
+            for key, count in counts.items():
+                writer.writerow([os.path.basename(file_path)] + list(key) + [count])
+
+
+def join_files(file_paths, output_file, keys=DEFAULT_KEYS, priority_columns=PRIORITY_COLUMNS):
+    """Left-join every further file onto the first on keys and stream the result to output_file.
+
+    Keys are matched ignoring case and whitespace. The first file is streamed
+    row by row; the others are held as compact tuples keyed by their key.
+    Keys found more than once are reported (and written to
+    <output>_duplicate_keys.csv) rather than silently overwritten; in a
+    lookup file the last row still wins.
+    """
+    start = time.perf_counter()
+    lookups = [index_file(file_path, keys) for file_path in file_paths[1:]]
+    reader = SheetReader(file_paths[0])
+    try:
+        positions = key_positions(reader.headers, keys, file_paths[0])
+        headers, sources = compile_plan([reader.headers] + [lookup[0] for lookup in lookups], priority_columns)
+        assemble = itemgetter(*sources)
+        blanks = [('',) * len(lookup[0]) for lookup in lookups]
+        writer = OutputWriter(output_file, headers)
+
+        rows = matched = 0
+        seen = {}
+        try:
+            for row in reader:
+                rows += 1
+                key = make_key(row, positions)
+                seen[key] = seen.get(key, 0) + 1
+                combined = row
+                found = False
+                for (_, index, _, _), blank in zip(lookups, blanks):
+                    match = index.get(key)
+                    found = found or match is not None
+                    combined = combined + (match if match is not None else blank)
+                matched += found
+                values = assemble(combined)
+                writer.append(list(values) if len(sources) > 1 else [values])
+        except BaseException:
+            # Don't leave a truncated output behind
+            writer.discard()
+            raise
+        writer.close()
+    finally:
+        reader.close()
+
+    duplicates = [(file_paths[0], {key: count for key, count in seen.items() if count > 1 and any(key)})]
+    duplicates += [(file_path, lookup[2]) for file_path, lookup in zip(file_paths[1:], lookups)]
+    print(f"Total rows in first file: {rows}")
+    for file_path, lookup in zip(file_paths[1:], lookups):
+        print(f"Total rows in {os.path.basename(file_path)}: {lookup[3]}")
+    print(f"Total rows in merged data: {rows} ({matched} matched)")
+    print(f"New column order: {headers}")
+    if any(counts for _, counts in duplicates):
+        for file_path, counts in duplicates:
+            if counts:
+                print(f"Warning: {len(counts)} key(s) appear more than once in {os.path.basename(file_path)}")
+        report_path = os.path.splitext(output_file)[0] + '_duplicate_keys.csv'
+        write_duplicate_report(report_path, keys, duplicates)
+        print(f"Duplicate keys listed in {report_path}")
+    print(f"Joined in {time.perf_counter() - start:.2f}s")
+    return rows
@@ -9,6 +9,7 @@ from tkinterdnd2 import TkinterDnD, DND_FILES
 from tkinter import messagebox
 import os
 import threading
+from sidecar import read_frame
 
 # Speed optimization: Set pyautogui to be faster
 pyautogui.PAUSE = 0.1  # Reduce default pause between actions
@@ -138,7 +139,7 @@ def process_data(df):
 def send_messages(file_path, status_label):
     try:
         # Load and pre-process data
-        df = pd.read_csv(file_path) if file_path.endswith('.csv') else pd.read_excel(file_path)
+        df = read_frame(file_path)
         df.columns = df.columns.str.strip()
         
         processed_data = process_data(df)
@@ -0,0 +1,187 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+# Top-k state saved between runs, one file per ranking script and source sheet
+STATE_FOLDER = os.path.join('Output', 'super40_topk_state')
+# Changed students printed to the console; the full list is saved to CSV
+CHANGES_SHOWN = 20
+
+
+def parse_scores(series):
+    """Marks as floats; "x/y" cells keep the numerator, blanks become NaN."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    numerators = series.astype('string').str.split('/').str[0].str.strip()
+    return pd.to_numeric(numerators, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def score_matrix(df, columns):
+    """Parse the given score columns once into a students x exams float matrix.
+
+    Columns missing from the sheet are treated as exams nobody wrote.
+    """
+    matrix = np.full((len(df), len(columns)), np.nan)
+    for position, column in enumerate(columns):
+        if column in df.columns:
+            matrix[:, position] = parse_scores(df[column])
+    return matrix
+
+
+def top_k_sum(matrix, k=4):
+    """Sum of each row's k best scores, ignoring NaN (fewer scores sum fewer)."""
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0])
+    filled = np.where(np.isnan(matrix), -np.inf, matrix)
+    if filled.shape[1] > k:
+        filled = np.partition(filled, filled.shape[1] - k, axis=1)[:, -k:]
+    return np.where(np.isinf(filled), 0.0, filled).sum(axis=1)
+
+
+def best_k(matrix, k):
+    """Each row's k best scores, best first, padded with -inf."""
+    filled = np.where(np.isnan(matrix), -np.inf, matrix)
+    if filled.shape[1] < k:
+        padding = np.full((filled.shape[0], k - filled.shape[1]), -np.inf)
+        filled = np.concatenate([filled, padding], axis=1)
+    return -np.sort(-filled, axis=1)[:, :k]
+
+
+class TopKState:
+    """Each student's best k scores per category, carried between runs.
+
+    Old columns are only hashed, not re-parsed: a student whose old marks
+    hash the same just merges the new column into their k best scores.
+    Students that are new, or whose old marks changed, are rebuilt from
+    all of the category's columns.
+    """
+
+    def __init__(self, k=4):
+        self.k = k
+        self.names = pd.Index([])
+        self.best = {}
+        self.hashes = {}
+
+    def align(self, names):
+        """Reorder the stored rows to match names; students without state get empty rows.
+
+        Empty rows carry a zero hash for every known column, so update()
+        rebuilds them from the sheet.
+        """
+        names = pd.Index(names)
+        if names.equals(self.names):
+            return
+        positions = np.full(len(names), -1)
+        if len(self.names) and names.is_unique and self.names.is_unique:
+            positions = self.names.get_indexer(names)
+        missing = positions < 0
+        take = np.where(missing, 0, positions)
+        for category, best in self.best.items():
+            if len(self.names):
+                self.best[category] = np.where(missing[:, None], -np.inf, best[take])
+            else:
+                self.best[category] = np.full((len(names), self.k), -np.inf)
+            self.hashes[category] = {
+                column: np.where(missing, 0, hashes[take]) if len(self.names) else np.zeros(len(names), dtype=np.uint64)
+                for column, hashes in self.hashes[category].items()
+            }
+        self.names = names
+
+    def update(self, df, categories, name_column='NAME'):
+        """Bring the state up to date with df; returns the columns that were new."""
+        self.align(df[name_column].astype(str))
+        added = []
+        for category, columns in categories.items():
+            columns = [column for column in columns if column in df.columns]
+            hashes = {column: pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+                      for column in columns}
+            known = self.hashes.get(category, {})
+            # Rebuild students whose old marks changed; everyone if an old column disappeared
+            if category not in self.best or any(column not in hashes for column in known):
+                dirty = np.ones(len(df), dtype=bool)
+            else:
+                dirty = np.zeros(len(df), dtype=bool)
+                for column, old_hashes in known.items():
+                    dirty |= hashes[column] != old_hashes
+            new_columns = [column for column in columns if column not in known]
+            best = self.best.get(category, np.full((len(df), self.k), -np.inf))
+
+            clean = ~dirty
+            for column in new_columns:
+                scores = parse_scores(df[column])[clean]
+                best[clean] = best_k(np.column_stack([best[clean], scores]), self.k)
+            if dirty.any():
+                best[dirty] = best_k(score_matrix(df[dirty], columns), self.k)
+
+            self.best[category] = best
+            self.hashes[category] = hashes
+            added.extend(new_columns)
+        return added
+
+    def totals(self, category):
+        best = self.best[category]
+        return np.where(np.isinf(best), 0.0, best).sum(axis=1)
+
+
+def state_path_for(script, source_path):
+    """State file for one script and source sheet, e.g. 'super40_average_ranklist.pkl'."""
+    stem = os.path.splitext(os.path.basename(source_path))[0].replace(' ', '_')
+    return os.path.join(STATE_FOLDER, f"{script}_{stem}.pkl")
+
+
+def report_changes(changes, output_path=None, name_column='NAME', limit=CHANGES_SHOWN):
+    """Print who changed totals (old -> new per category) and save the full list to output_path."""
+    print(f"{len(changes)} student(s) changed totals since the last run")
+    if changes.empty:
+        return
+    categories = [column[:-len(' (now)')] for column in changes.columns if column.endswith(' (now)')]
+    for _, row in changes.head(limit).iterrows():
+        moves = [f"{category} {row[f'{category} (before)']:g} -> {row[f'{category} (now)']:g}"
+                 for category in categories if row[f'{category} (before)'] != row[f'{category} (now)']]
+        print(f"  {row[name_column]}: {', '.join(moves)}")
+    if len(changes) > limit:
+        print(f"  ... and {len(changes) - limit} more")
+    if output_path:
+        changes.to_csv(output_path, index=False)
+        print(f"Changed totals saved to {output_path}")
+
+
+def incremental_top_k(df, categories, state_path, k=4, name_column='NAME'):
+    """Top-k totals per category, reusing the state saved by the previous run.
+
+    Returns (totals, changes): totals maps category -> array aligned with df,
+    changes lists the students whose totals moved since the saved state.
+    """
+    state = None
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable ranking state {state_path}: {e}")
+    if state is None or state.k != k:
+        state = TopKState(k)
+
+    state.align(df[name_column].astype(str))
+    previous = {category: state.totals(category) for category in state.best}
+    start = time.perf_counter()
+    added = state.update(df, categories, name_column)
+    totals = {category: state.totals(category) for category in categories}
+    print(f"Updated top-{k} totals with {len(added)} new column(s) in {time.perf_counter() - start:.3f}s")
+
+    changes = pd.DataFrame({name_column: df[name_column].to_numpy()})
+    moved = np.zeros(len(df), dtype=bool)
+    for category, current in totals.items():
+        before = previous.get(category, np.zeros(len(df)))
+        changes[f'{category} (before)'] = before
+        changes[f'{category} (now)'] = current
+        moved |= before != current
+    changes = changes[moved].reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    with open(state_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return totals, changes
@@ -0,0 +1,219 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+FIRST_NAMES = ['Aarav', 'Vihaan', 'Aditya', 'Arjun', 'Sai', 'Reyansh', 'Krishna', 'Ishaan', 'Rohan', 'Kabir',
+               'Ananya', 'Diya', 'Aadhya', 'Saanvi', 'Pari', 'Anika', 'Myra', 'Sara', 'Riya', 'Meera',
+               'Omkar', 'Pranav', 'Siddharth', 'Yash', 'Tanvi', 'Sneha', 'Shreya', 'Harsh', 'Atharva', 'Vedant']
+LAST_NAMES = ['Sharma', 'Patil', 'Deshmukh', 'Kulkarni', 'Joshi', 'Shinde', 'Pawar', 'Jadhav', 'Shaikh', 'Khan',
+              'Gaikwad', 'Chavan', 'More', 'Yadav', 'Singh', 'Kadam', 'Bhosale', 'Naik', 'Mane', 'Kale']
+CLASSES = ['XI- NDA A', 'XI- NDA B', 'XII- NDA A', 'XII- NDA B', 'XII- NDA C', 'XI- JEE/NEET']
+SUBJECTS = ['Maths', 'Physics', 'English', 'GK', 'Chemistry']
+# Evalbee export names: grade, exam type, date (see "new aligner.py")
+EVALBEE_TYPES = ['GAT', 'MATHS', 'MHTCET', 'JEE', 'NEET']
+ABSENT_RATE = 0.1
+
+
+def student_names(rng, students):
+    """Unique, realistic-looking names; a middle initial keeps large rosters unique."""
+    first = rng.choice(FIRST_NAMES, students)
+    last = rng.choice(LAST_NAMES, students)
+    return [f"{f} {chr(65 + i % 26)}{'' if i < 26 else i // 26} {l}" for i, (f, l) in enumerate(zip(first, last))]
+
+
+def phone_numbers(rng, count):
+    return rng.integers(7_000_000_000, 9_999_999_999, count, dtype=np.int64)
+
+
+def with_absences(rng, values, rate=ABSENT_RATE):
+    values = values.astype(float)
+    values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def write_sheet(df, path):
+    if path.lower().endswith('.csv'):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+
+def make_roster(rng, students):
+    names = student_names(rng, students)
+    return pd.DataFrame({
+        'EMP CODE': np.arange(1001, 1001 + students),
+        'Roll No': np.arange(1, students + 1),
+        'Name': names,
+        'CLASS': rng.choice(CLASSES, students),
+        'Student Contact No.': phone_numbers(rng, students),
+        'Father/Guardian Contact No.': phone_numbers(rng, students),
+        'Mother/Guardian Contact No.': phone_numbers(rng, students),
+    })
+
+
+def write_contacts(roster, folder, file_format):
+    """Data/ sheets for the aligners and for the attendance merger."""
+    os.makedirs(folder, exist_ok=True)
+    write_sheet(roster[['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']],
+                os.path.join(folder, f'student_contacts.{file_format}'))
+    write_sheet(pd.DataFrame({
+        'EMP CODE': roster['EMP CODE'],
+        'NAME': roster['Name'],
+        'CLASS': roster['CLASS'],
+        'MOTHER NO': roster['Mother/Guardian Contact No.'],
+        'FATHER NO': roster['Father/Guardian Contact No.'],
+        'SELF NO': roster['Student Contact No.'],
+    }), os.path.join(folder, f'attendance_contacts.{file_format}'))
+
+
+def write_log_records(rng, roster, folder, days, start_date, file_format):
+    """Biometric device exports: an 'Emp Code' / 'Log Records' header, then one row of punches per code."""
+    os.makedirs(folder, exist_ok=True)
+    codes = roster['EMP CODE'].to_numpy()
+    for day in pd.date_range(start_date, periods=days, freq='B'):
+        present = codes[rng.random(len(codes)) > ABSENT_RATE]
+        arrive = rng.normal(9 * 60 + 15, 12, len(present)).astype(int)
+        leave = rng.normal(16 * 60 + 30, 20, len(present)).astype(int)
+        rows = [['Emp Code', 'Log Records']]
+        rows += [[str(code), f'{a // 60:02d}:{a % 60:02d}', f'{l // 60:02d}:{l % 60:02d}']
+                 for code, a, l in zip(present, arrive, leave)]
+        path = os.path.join(folder, f"Device Log {day:%d-%m-%Y}.{file_format}")
+        if file_format == 'csv':
+            pd.DataFrame(rows).to_csv(path, index=False, header=False)
+        else:
+            workbook = openpyxl.Workbook(write_only=True)
+            sheet = workbook.create_sheet()
+            for row in rows:
+                sheet.append(row)
+            workbook.save(path)
+
+
+def write_evalbee(rng, roster, folder, exams, start_date):
+    """Evalbee exports named '<GRADE> <TYPE> DD-MM-YYYY.xlsx' with Name, Exam and marks."""
+    os.makedirs(folder, exist_ok=True)
+    dates = pd.date_range(start_date, periods=exams, freq='W')
+    for grade in ['11TH', '12TH']:
+        students = roster[roster['CLASS'].str.startswith('XI-' if grade == '11TH' else 'XII-')]
+        for exam_type in EVALBEE_TYPES:
+            for number, date in enumerate(dates, 1):
+                df = pd.DataFrame({
+                    'Name': students['Name'].to_numpy(),
+                    'Exam': f'{exam_type} WEEKLY TEST {number}',
+                    'Total Marks': with_absences(rng, rng.integers(0, 300, len(students))),
+                    'Roll No': students['Roll No'].to_numpy(),
+                })
+                if exam_type == 'GAT':
+                    df['ENGLISH'] = with_absences(rng, rng.integers(0, 200, len(students)))
+                    df['GAT'] = with_absences(rng, rng.integers(0, 400, len(students)))
+                write_sheet(df, os.path.join(folder, f"{grade} {exam_type} {date:%d-%m-%Y}.xlsx"))
+
+
+def make_results_wide(rng, roster, exams):
+    """Wide aligner output (Exam{i}, Total Marks{i}, GAT{i}, ENGLISH{i}) as read by the senders."""
+    df = roster[['Name', 'Student Contact No.', 'Father/Guardian Contact No.', 'Mother/Guardian Contact No.']].copy()
+    columns = {}
+    for number in range(1, exams + 1):
+        exam_type = EVALBEE_TYPES[(number - 1) % len(EVALBEE_TYPES)]
+        columns[f'Exam{number}'] = f'{exam_type} WEEKLY TEST {number}'
+        if exam_type == 'GAT':
+            columns[f'ENGLISH{number}'] = with_absences(rng, rng.integers(0, 200, len(df)))
+            columns[f'GAT{number}'] = with_absences(rng, rng.integers(0, 400, len(df)))
+        else:
+            columns[f'Total Marks{number}'] = with_absences(rng, rng.integers(0, 300, len(df)))
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def make_super40(rng, roster, exams):
+    """SUPER40 input: GAT / MATHS exams (some marks as "x/y") plus five subjective tests."""
+    df = pd.DataFrame({'NAME': roster['Name'], 'CLASS': roster['CLASS']})
+    columns = {}
+    for number in range(1, exams + 1):
+        is_gat = number % 2 == 1
+        columns[f'Exam{number}'] = f"{'GAT' if is_gat else 'MATHS'} WEEKLY TEST {number}"
+        maximum = 400 if is_gat else 188
+        marks = with_absences(rng, rng.integers(0, maximum, len(df))).astype(object)
+        fractional = rng.random(len(df)) < 0.2
+        marks[fractional] = [f'{int(m)}/{maximum}' if pd.notna(m) else m for m in marks[fractional]]
+        columns[f'Total Marks{number}'] = marks
+    for number in range(1, 6):
+        columns[f'Subjective Marks{number}'] = with_absences(rng, rng.integers(0, 25, len(df)))
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def make_subjective(rng, roster, tests, start_date):
+    """Subjective-test sheet as read by subwhatsend.py."""
+    df = pd.DataFrame({
+        'NAME': roster['Name'],
+        'SELF NO': roster['Student Contact No.'],
+        'FATHER NO': roster['Father/Guardian Contact No.'],
+        'MOTHER NO': roster['Mother/Guardian Contact No.'],
+    })
+    columns = {}
+    for number, date in enumerate(pd.date_range(start_date, periods=tests, freq='W'), 1):
+        columns[f'Subjective Date{number}'] = date
+        columns[f'Subject{number}'] = SUBJECTS[(number - 1) % len(SUBJECTS)]
+        columns[f'Subjective Marks{number}'] = with_absences(rng, rng.integers(0, 25, len(df)))
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def write_combiner_inputs(results, folder, parts=3):
+    """Overlapping per-batch sheets for file_combiner (e.g. '11TH JEE part1.xlsx')."""
+    os.makedirs(folder, exist_ok=True)
+    bounds = np.linspace(0, len(results), parts + 1).astype(int)
+    # Every part repeats the first tenth of the rows, like re-exported batches
+    overlap = results.iloc[:max(len(results) // 10, 1)]
+    for category in ['11TH JEE', '12TH NEET', '11TH']:
+        for part in range(parts):
+            chunk = results.iloc[bounds[part]:bounds[part + 1]]
+            write_sheet(pd.concat([chunk, overlap]), os.path.join(folder, f"{category} part{part + 1}.xlsx"))
+
+
+def generate(output_dir='Synthetic', students=1000, exams=6, days=5, seed=0, file_format='xlsx',
+             start_date='2024-06-03'):
+    """Write a full set of synthetic pipeline inputs under output_dir."""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    roster = make_roster(rng, students)
+    write_sheet(roster[['Roll No', 'Name']], os.path.join(output_dir, f'roster.{file_format}'))
+    write_contacts(roster, os.path.join(output_dir, 'Data'), file_format)
+    write_log_records(rng, roster, os.path.join(output_dir, 'Log Records'), days, start_date, file_format)
+    write_evalbee(rng, roster, os.path.join(output_dir, 'Evalbee'), exams, start_date)
+
+    results = make_results_wide(rng, roster, exams)
+    write_sheet(results, os.path.join(output_dir, f'results_wide.{file_format}'))
+    write_sheet(make_super40(rng, roster, exams), os.path.join(output_dir, f'super40.{file_format}'))
+    write_sheet(make_subjective(rng, roster, exams, start_date), os.path.join(output_dir, f'subjective.{file_format}'))
+
+    # merger.py joins sheets on Name: split the results between two files with a shared Name column
+    merger_folder = os.path.join(output_dir, 'merger')
+    os.makedirs(merger_folder, exist_ok=True)
+    half = len(results.columns) // 2
+    write_sheet(results.iloc[:, :half], os.path.join(merger_folder, 'part1.xlsx'))
+    write_sheet(results[['Name'] + list(results.columns[half:])], os.path.join(merger_folder, 'part2.xlsx'))
+
+    write_combiner_inputs(results, os.path.join(output_dir, 'aligner'))
+    print(f"Synthetic data for {students} students written to {output_dir} in {time.perf_counter() - start:.1f}s")
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic ADCI pipeline inputs.")
+    parser.add_argument('--output', default='Synthetic', help="output folder (default: Synthetic)")
+    parser.add_argument('--students', type=int, default=1000, help="students / rows per sheet (1k-1M)")
+    parser.add_argument('--exams', type=int, default=6, help="exams per exam type")
+    parser.add_argument('--days', type=int, default=5, help="days of attendance exports")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx',
+                        help="format for sheets whose readers accept both")
+    args = parser.parse_args()
+    generate(args.output, args.students, args.exams, args.days, args.seed, args.format)
+
+
+if __name__ == "__main__":
+    main()